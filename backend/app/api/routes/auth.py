@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 import re
 
 from app.database import get_db, User
 from app.schemas import SignupRequest, LoginRequest, LoginResponse
-from app.core.auth import authenticate_user, create_access_token, get_password_hash
+from app.core.admission import hash_admission
+from app.core.auth import (
+    authenticate_user_async,
+    create_access_token,
+    get_password_hash_async,
+)
 from app.core.config import settings
+from app.core.mentor_search import index_mentor
+from app.core.suggestions import suggestion_index
 
 router = APIRouter()
 
@@ -18,6 +25,7 @@ def validate_email(email: str) -> bool:
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup(
     signup_data: SignupRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Register a new user"""
@@ -66,7 +74,9 @@ async def signup(
         )
     
     # Create new user
-    hashed_password = get_password_hash(signup_data.password)
+    client_ip = request.client.host if request.client else None
+    async with hash_admission.admit(email=signup_data.email, client_ip=client_ip):
+        hashed_password = await get_password_hash_async(signup_data.password)
     db_user = User(
         email=signup_data.email,
         hashed_password=hashed_password,
@@ -75,14 +85,19 @@ async def signup(
     )
     
     db.add(db_user)
+    db.flush()
+    index_mentor(db, db_user)
     db.commit()
     db.refresh(db_user)
+    if db_user.role == "mentor":
+        suggestion_index.update_mentor(db_user.id, db_user.name)
     
     return {"message": "User created successfully"}
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Authenticate user and return JWT token"""
@@ -98,7 +113,9 @@ async def login(
             detail={"error": "Password is required"}
         )
     
-    user = authenticate_user(db, login_data.email, login_data.password)
+    client_ip = request.client.host if request.client else None
+    async with hash_admission.admit(email=login_data.email, client_ip=client_ip):
+        user = await authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,7 +129,8 @@ async def login(
             "sub": str(user.id),
             "email": user.email,
             "name": user.name,
-            "role": user.role
+            "role": user.role,
+            "ver": user.token_version
         },
         expires_delta=access_token_expires
     )
@@ -0,0 +1,68 @@
+import secrets
+from typing import Callable, Iterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import get_db, MatchingRequest, User
+from app.core.config import settings
+from app.core.serializers import matching_request_item, user_item
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def require_export_key(x_api_key: Optional[str] = Header(None)):
+    """Allow exports only with the configured X-API-Key"""
+    if settings.EXPORT_API_KEY is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Export is disabled"
+        )
+    if x_api_key is None or not secrets.compare_digest(
+        x_api_key, settings.EXPORT_API_KEY
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid export API key"
+        )
+
+def stream_ndjson(
+    db: Session, statement, build: Callable[[object], dict]
+) -> StreamingResponse:
+    """Stream rows of ``statement`` as newline-delimited JSON, one chunk per batch.
+
+    Rows are fetched ``EXPORT_BATCH_SIZE`` at a time, so memory use does not
+    grow with the number of rows.
+    """
+    def chunks() -> Iterator[bytes]:
+        result = db.scalars(
+            statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        for batch in result.partitions():
+            yield b"".join(
+                orjson.dumps(build(row), option=orjson.OPT_APPEND_NEWLINE)
+                for row in batch
+            )
+
+    return StreamingResponse(chunks(), media_type=NDJSON_MEDIA_TYPE)
+
+@router.get("/export/mentors", dependencies=[Depends(require_export_key)])
+async def export_mentors(db: Session = Depends(get_db)):
+    """Every mentor, one JSON object per line"""
+    statement = (
+        select(User)
+        .filter(User.role == "mentor")
+        .order_by(User.id)
+        .options(selectinload(User.skills))
+    )
+    return stream_ndjson(db, statement, user_item)
+
+@router.get("/export/match-requests", dependencies=[Depends(require_export_key)])
+async def export_matching_requests(db: Session = Depends(get_db)):
+    """Every matching request, one JSON object per line"""
+    statement = select(MatchingRequest).order_by(MatchingRequest.id)
+    return stream_ndjson(db, statement, matching_request_item)
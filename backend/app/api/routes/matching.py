@@ -1,17 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db, User, MatchingRequest
 from app.schemas import MatchingRequestCreate, MatchingRequestResponse, MatchingRequestUpdate, MatchingRequestOutgoing
-from app.core.auth import get_current_user
+from app.core.auth import Principal, get_current_principal
+from app.core.fieldsets import parse_fields, sparse_response
+from app.core.serializers import matching_request_item, outgoing_request_item
 
 router = APIRouter()
 
+# Columns behind each field accepted by fields=, in response order
+MATCH_REQUEST_COLUMNS = {
+    "id": MatchingRequest.id,
+    "menteeId": MatchingRequest.mentee_id,
+    "mentorId": MatchingRequest.mentor_id,
+    "message": MatchingRequest.message,
+    "status": MatchingRequest.status,
+}
+# Outgoing requests never include the message
+OUTGOING_FIELDS = ["id", "menteeId", "mentorId", "status"]
+
+FIELDS_QUERY = Query(
+    None, description="Comma separated fields to return, e.g. 'id,status'"
+)
+
+def sparse_matching_requests(
+    db: Session, response: Response, condition, fields: List[str]
+):
+    """Matching requests with only the requested fields, selecting just their columns"""
+    rows = db.query(*[MATCH_REQUEST_COLUMNS[name] for name in fields]).filter(
+        condition
+    ).order_by(MatchingRequest.created_at.desc())
+    return sparse_response([dict(zip(fields, row)) for row in rows], response)
+
 @router.post("/match-requests", response_model=MatchingRequestResponse)
 async def create_matching_request(
     request_data: MatchingRequestCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Create a new matching request (mentee to mentor)"""
@@ -61,47 +87,41 @@ async def create_matching_request(
     db.commit()
     db.refresh(matching_request)
     
-    return MatchingRequestResponse(
-        id=matching_request.id,
-        menteeId=matching_request.mentee_id,
-        mentorId=matching_request.mentor_id,
-        message=matching_request.message,
-        status=matching_request.status
-    )
+    return matching_request_item(matching_request)
 
 @router.get("/match-requests", response_model=List[MatchingRequestResponse])
 async def get_matching_requests(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get matching requests for current user"""
     if current_user.role == "mentee":
         # Mentees see their sent requests
-        requests = db.query(MatchingRequest).filter(
-            MatchingRequest.mentee_id == current_user.id
-        ).order_by(MatchingRequest.created_at.desc()).all()
+        condition = MatchingRequest.mentee_id == current_user.id
     else:
         # Mentors see requests sent to them
-        requests = db.query(MatchingRequest).filter(
-            MatchingRequest.mentor_id == current_user.id
-        ).order_by(MatchingRequest.created_at.desc()).all()
-    
-    return [
-        MatchingRequestResponse(
-            id=req.id,
-            menteeId=req.mentee_id,
-            mentorId=req.mentor_id,
-            message=req.message,
-            status=req.status
-        )
-        for req in requests
-    ]
+        condition = MatchingRequest.mentor_id == current_user.id
+    
+    field_list = parse_fields(fields, list(MATCH_REQUEST_COLUMNS))
+    if field_list is not None:
+        return sparse_matching_requests(db, response, condition, field_list)
+    
+    requests = (
+        db.query(MatchingRequest)
+        .filter(condition)
+        .order_by(MatchingRequest.created_at.desc())
+        .all()
+    )
+    
+    return [matching_request_item(req) for req in requests]
 
 @router.put("/match-requests/{request_id}", response_model=MatchingRequestResponse)
 async def update_matching_request(
     request_id: int,
     request_update: MatchingRequestUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Update matching request status (mentor accepts/rejects)"""
@@ -149,17 +169,13 @@ async def update_matching_request(
     db.commit()
     db.refresh(matching_request)
     
-    return MatchingRequestResponse(
-        id=matching_request.id,
-        menteeId=matching_request.mentee_id,
-        mentorId=matching_request.mentor_id,
-        message=matching_request.message,
-        status=matching_request.status
-    )
+    return matching_request_item(matching_request)
 
 @router.get("/match-requests/incoming", response_model=List[MatchingRequestResponse])
 async def get_incoming_matching_requests(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get incoming matching requests (for mentors)"""
@@ -169,24 +185,23 @@ async def get_incoming_matching_requests(
             detail="Only mentors can view incoming requests"
         )
     
+    field_list = parse_fields(fields, list(MATCH_REQUEST_COLUMNS))
+    if field_list is not None:
+        return sparse_matching_requests(
+            db, response, MatchingRequest.mentor_id == current_user.id, field_list
+        )
+    
     requests = db.query(MatchingRequest).filter(
         MatchingRequest.mentor_id == current_user.id
     ).order_by(MatchingRequest.created_at.desc()).all()
     
-    return [
-        MatchingRequestResponse(
-            id=req.id,
-            menteeId=req.mentee_id,
-            mentorId=req.mentor_id,
-            message=req.message,
-            status=req.status
-        )
-        for req in requests
-    ]
+    return [matching_request_item(req) for req in requests]
 
 @router.get("/match-requests/outgoing", response_model=List[MatchingRequestOutgoing])
 async def get_outgoing_matching_requests(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    fields: Optional[str] = FIELDS_QUERY,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get outgoing matching requests (for mentees)"""
@@ -196,24 +211,22 @@ async def get_outgoing_matching_requests(
             detail={"error": "Only mentees can view outgoing requests"}
         )
     
+    field_list = parse_fields(fields, OUTGOING_FIELDS)
+    if field_list is not None:
+        return sparse_matching_requests(
+            db, response, MatchingRequest.mentee_id == current_user.id, field_list
+        )
+    
     requests = db.query(MatchingRequest).filter(
         MatchingRequest.mentee_id == current_user.id
     ).order_by(MatchingRequest.created_at.desc()).all()
     
-    return [
-        MatchingRequestOutgoing(
-            id=req.id,
-            menteeId=req.mentee_id,
-            mentorId=req.mentor_id,
-            status=req.status
-        )
-        for req in requests
-    ]
+    return [outgoing_request_item(req) for req in requests]
 
 @router.delete("/match-requests/{request_id}")
 async def delete_matching_request(
     request_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Delete matching request (mentee cancels their request)"""
@@ -237,13 +250,7 @@ async def delete_matching_request(
         )
     
     # Return the cancelled request format per API spec
-    response = MatchingRequestResponse(
-        id=matching_request.id,
-        mentorId=matching_request.mentor_id,
-        menteeId=matching_request.mentee_id,
-        message=matching_request.message,
-        status="cancelled"
-    )
+    response = {**matching_request_item(matching_request), "status": "cancelled"}
     
     # Delete the request
     db.delete(matching_request)
@@ -254,7 +261,7 @@ async def delete_matching_request(
 @router.put("/match-requests/{request_id}/accept", response_model=MatchingRequestResponse)
 async def accept_matching_request(
     request_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Accept a matching request (mentor accepts)"""
@@ -294,18 +301,12 @@ async def accept_matching_request(
     db.commit()
     db.refresh(matching_request)
     
-    return MatchingRequestResponse(
-        id=matching_request.id,
-        menteeId=matching_request.mentee_id,
-        mentorId=matching_request.mentor_id,
-        message=matching_request.message,
-        status=matching_request.status
-    )
+    return matching_request_item(matching_request)
 
 @router.put("/match-requests/{request_id}/reject", response_model=MatchingRequestResponse)
 async def reject_matching_request(
     request_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Reject a matching request (mentor rejects)"""
@@ -333,10 +334,4 @@ async def reject_matching_request(
     db.commit()
     db.refresh(matching_request)
     
-    return MatchingRequestResponse(
-        id=matching_request.id,
-        menteeId=matching_request.mentee_id,
-        mentorId=matching_request.mentor_id,
-        message=matching_request.message,
-        status=matching_request.status
-    )
+    return matching_request_item(matching_request)
@@ -1,25 +1,183 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import and_, func, tuple_
+from sqlalchemy.orm import Session, aliased, load_only, selectinload
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional
+from urllib.parse import quote
 
-from app.database import get_db, User
-from app.schemas import MentorListItem
-from app.core.auth import get_current_user
+from app.database import get_db, User, MenteeInterest, MentorSkill, Skill
+from app.schemas import MentorListItem, MentorSuggestions, SkillFacet
+from app.core.auth import Principal, get_current_principal
+from app.core.config import settings
+from app.core.fieldsets import parse_fields, sparse_response
+from app.core.mentor_search import search_filter, search_matches
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.core.recommendations import mentor_recommender
+from app.core.serializers import profile_image_url, user_item
+from app.core.skill_query import (
+    SkillQueryError,
+    parse_skill_query,
+    skill_query_condition,
+)
+from app.core.skill_trigrams import skill_trigrams
+from app.core.skills import skill_labels
+from app.core.suggestions import suggestion_index
+from app.core.tfidf_index import mentor_tfidf
 
 router = APIRouter()
 
-def get_profile_image_url(user: User) -> str:
-    """Get profile image URL for user"""
-    return f"/images/{user.role}/{user.id}"
+# Fields accepted by fields=, in response order; "profile" selects the nested ones
+MENTOR_FIELDS = ["id", "email", "role", "name", "bio", "imageUrl", "skills"]
+MENTOR_FIELD_GROUPS = {"profile": ["name", "bio", "imageUrl", "skills"]}
+# Columns each field reads (id is always loaded); skills are only listed for mentors
+MENTOR_FIELD_COLUMNS = {
+    "id": [],
+    "email": [User.email],
+    "role": [User.role],
+    "name": [User.name],
+    "bio": [User.bio],
+    "imageUrl": [User.role],
+    "skills": [User.role],
+}
+
+def parse_mentor_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse the fields= parameter; None means every field"""
+    return parse_fields(fields, MENTOR_FIELDS, MENTOR_FIELD_GROUPS)
+
+def mentor_load_options(fields: Optional[List[str]]) -> list:
+    """Loader options reading only the columns (and skills) the fields need"""
+    if fields is None:
+        return [selectinload(User.skills)]
+    columns = dict.fromkeys(
+        column for name in fields for column in MENTOR_FIELD_COLUMNS[name]
+    )
+    options = [load_only(User.id, *columns)]
+    if "skills" in fields:
+        options.append(selectinload(User.skills))
+    return options
+
+def to_sparse_mentor(mentor: User, fields: List[str]) -> dict:
+    """Mentor representation holding only the requested fields"""
+    item = {}
+    profile = {}
+    for name in fields:
+        if name == "imageUrl":
+            profile[name] = profile_image_url(mentor)
+        elif name == "skills":
+            profile[name] = skill_labels(mentor)
+        elif name in MENTOR_FIELD_GROUPS["profile"]:
+            profile[name] = getattr(mentor, name)
+        else:
+            item[name] = getattr(mentor, name)
+    if profile:
+        item["profile"] = profile
+    return item
+
+def mentors_response(
+    mentors: List[User], fields: Optional[List[str]], response: Response
+):
+    """Mentor list items, narrowed to the requested fields when fields= is given"""
+    if fields is None:
+        return [user_item(mentor) for mentor in mentors]
+    return sparse_response(
+        [to_sparse_mentor(mentor, fields) for mentor in mentors], response
+    )
+
+def parse_skills_param(skills: str):
+    """Parse the skills= expression, rejecting malformed ones with 400"""
+    try:
+        return parse_skill_query(skills)
+    except SkillQueryError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid skill expression: {exc}"
+        )
+
+def resolve_skill_param(db: Session, response: Response, text: str) -> Optional[str]:
+    """Canonical skill key ``text`` most likely means, echoed in X-Resolved-Skill"""
+    resolved = skill_trigrams.resolve(db, text)
+    if resolved is None:
+        return None
+    key, name = resolved
+    response.headers["X-Resolved-Skill"] = quote(name)
+    return key
+
+def load_mentors(
+    db: Session, mentor_ids: List[int], fields: Optional[List[str]] = None
+) -> Dict[int, User]:
+    """Mentors with the given ids (and their skills) in one query, by id"""
+    if not mentor_ids:
+        return {}
+    mentors = (
+        db.query(User)
+        .filter(User.id.in_(mentor_ids), User.role == "mentor")
+        .options(*mentor_load_options(fields))
+    )
+    return {mentor.id: mentor for mentor in mentors}
+
+def mentors_in_order(db: Session, mentor_ids: List[int]) -> List[dict]:
+    """Load mentors by id and return them in the given order"""
+    mentors_by_id = load_mentors(db, mentor_ids)
+    return [
+        user_item(mentors_by_id[mentor_id])
+        for mentor_id in mentor_ids
+        if mentor_id in mentors_by_id
+    ]
+
+def parse_ids_param(ids: str) -> List[int]:
+    """Parse the comma separated ids= list, keeping the first of any repeats"""
+    try:
+        mentor_ids = list(
+            dict.fromkeys(int(part) for part in ids.split(",") if part.strip())
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma separated list of mentor ids"
+        )
+    if len(mentor_ids) > settings.MENTORS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MENTORS_MAX_PAGE_SIZE} ids per request"
+        )
+    return mentor_ids
 
 @router.get("/mentors", response_model=List[MentorListItem])
 async def get_mentors(
+    response: Response,
     tech_stack: Optional[str] = Query(None, description="Filter by tech stack"),
-    skill: Optional[str] = Query(None, description="Filter by skill (alias for tech_stack)"),
-    search: Optional[str] = Query(None, description="Search by name"),
-    sort_by: Optional[str] = Query("name", description="Sort by field (name, tech_stack)"),
-    current_user: User = Depends(get_current_user),
+    skill: Optional[str] = Query(
+        None, description="Filter by skill (alias for tech_stack)"
+    ),
+    skills: Optional[str] = Query(
+        None,
+        description="Filter by skill expression, e.g. 'react AND (typescript OR js)'"
+    ),
+    search: Optional[str] = Query(None, description="Search by name, bio and skills"),
+    sort_by: Optional[str] = Query(
+        None,
+        description=(
+            "Sort by field (name, tech_stack, relevance); "
+            "defaults to relevance when searching, else name"
+        ),
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.MENTORS_MAX_PAGE_SIZE,
+        description="Page size; enables cursor pagination"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor header of the previous page"
+    ),
+    ids: Optional[str] = Query(
+        None,
+        description="Comma separated mentor ids to look up; other filters are ignored"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma separated fields to return, e.g. 'id,name'"
+    ),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get list of mentors with optional filtering and sorting"""
@@ -30,76 +188,250 @@ async def get_mentors(
             detail="Only mentees can view mentors list"
         )
     
-    # Build query
-    query = db.query(User).filter(User.role == "mentor")
+    field_list = parse_mentor_fields(fields)
+    
+    if ids is not None:
+        # Batch lookup in the requested order, reporting ids that aren't mentors
+        mentor_ids = parse_ids_param(ids)
+        mentors_by_id = load_mentors(db, mentor_ids, field_list)
+        missing = [
+            mentor_id for mentor_id in mentor_ids if mentor_id not in mentors_by_id
+        ]
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(map(str, missing))
+        mentors = [
+            mentors_by_id[mentor_id]
+            for mentor_id in mentor_ids
+            if mentor_id in mentors_by_id
+        ]
+        return mentors_response(mentors, field_list, response)
+    
+    if sort_by is None:
+        sort_by = "relevance" if search else "name"
+    
+    # Build query, loading only the requested columns and skills in one extra query
+    query = (
+        db.query(User)
+        .filter(User.role == "mentor")
+        .options(*mentor_load_options(field_list))
+    )
     
     # Apply filters
     filter_skill = tech_stack or skill  # Use tech_stack or skill parameter
     if filter_skill:
-        # Filter mentors who have the specified tech_stack/skill
-        # First, get all mentors with tech_stack
-        mentors_with_tech = query.filter(User.tech_stack.isnot(None)).all()
-        filtered_mentors = []
-        for mentor in mentors_with_tech:
-            try:
-                tech_list = json.loads(mentor.tech_stack) if mentor.tech_stack else []
-                if filter_skill in tech_list:
-                    filtered_mentors.append(mentor)
-            except json.JSONDecodeError:
-                continue
+        # Tolerate typos, then join through the indexed mentor_skills table
+        resolved_key = resolve_skill_param(db, response, filter_skill)
+        skill_id = None
+        if resolved_key:
+            skill_id = db.query(Skill.id).filter(Skill.key == resolved_key).scalar()
         
         # If no mentors found with the skill, return empty list
-        if not filtered_mentors:
+        if skill_id is None:
             return []
         
-        # Convert to query with specific IDs
-        mentor_ids = [m.id for m in filtered_mentors]
-        query = query.filter(User.id.in_(mentor_ids))
+        query = query.join(MentorSkill, MentorSkill.mentor_id == User.id).filter(
+            MentorSkill.skill_id == skill_id
+        )
+    
+    if skills:
+        # One EXISTS per skill term keeps the statement size bounded
+        query = query.filter(skill_query_condition(parse_skills_param(skills)))
     
+    matches = None
     if search:
-        query = query.filter(User.name.like(f'%{search}%'))
+        # Full-text search over the FTS5 index, or substring match without it
+        matches = search_matches(db, search)
+        if matches is None:
+            query = query.filter(search_filter(search))
+        else:
+            query = query.join(matches, matches.c.mentor_id == User.id)
     
-    # Apply sorting
-    if sort_by == "name":
-        query = query.order_by(User.name)
+    # Apply sorting; id breaks ties so every mentor has a unique position
+    if sort_by == "relevance" and matches is not None:
+        sort_columns = [matches.c.rank, User.id]
+        sort_types = [float, int]
+    elif sort_by in ("name", "relevance"):
+        sort_columns = [User.name, User.id]
+        sort_types = [str, int]
     elif sort_by == "tech_stack":
-        query = query.order_by(User.tech_stack)
+        # Order by each mentor's first listed skill
+        first_skill = aliased(MentorSkill)
+        first_skill_key = aliased(Skill)
+        query = query.outerjoin(
+            first_skill,
+            and_(first_skill.mentor_id == User.id, first_skill.position == 0),
+        ).outerjoin(first_skill_key, first_skill_key.id == first_skill.skill_id)
+        sort_columns = [func.coalesce(first_skill_key.key, ""), User.name, User.id]
+        sort_types = [str, str, int]
+    else:
+        sort_columns = [User.id]
+        sort_types = [int]
+    query = query.order_by(*sort_columns)
     
-    mentors = query.all()
+    # Keyset pagination: continue after the last mentor of the previous page
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort_by, sort_types)
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.filter(tuple_(*sort_columns) > tuple_(*after))
+    
+    # Select the sort values too, so a cursor can be built from the last row
+    query = query.add_columns(*sort_columns)
+    if limit is None and cursor:
+        limit = settings.MENTORS_PAGE_SIZE
+    if limit is None:
+        rows = query.all()
+    else:
+        # One extra row tells whether there is a next page
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                sort_by, list(rows[-1][1:])
+            )
+    mentors = [row[0] for row in rows]
     
     # Convert to response format
-    mentor_list = []
-    for mentor in mentors:
-        tech_stack_list = None
-        if mentor.tech_stack:
-            try:
-                tech_stack_list = json.loads(mentor.tech_stack)
-            except json.JSONDecodeError:
-                tech_stack_list = []
-        
-        profile_image_url = get_profile_image_url(mentor)
-        
-        # Create profile data according to API spec
-        profile_data = {
-            "name": mentor.name,
-            "bio": mentor.bio,
-            "imageUrl": profile_image_url,
-            "skills": tech_stack_list
-        }
-        
-        mentor_list.append(MentorListItem(
-            id=mentor.id,
-            email=mentor.email,
-            role=mentor.role,
-            profile=profile_data
-        ))
+    return mentors_response(mentors, field_list, response)
+
+@router.get("/mentors/search", response_model=List[MentorListItem])
+async def search_mentors(
+    q: str = Query(
+        ..., min_length=1, description="What the mentee is looking for, in plain words"
+    ),
+    k: int = Query(
+        10, ge=1, le=settings.MENTORS_MAX_PAGE_SIZE, description="Number of results"
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Rank mentors by TF-IDF similarity of their bio and skills to a free-text query"""
+    # Only mentees can view mentors list
+    if current_user.role != "mentee":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only mentees can view mentors list"
+        )
     
-    return mentor_list
+    # A stale matrix is rebuilt here, so keep it off the event loop
+    ranked = await run_in_threadpool(mentor_tfidf.search, db, q, k)
+    return mentors_in_order(db, [mentor_id for mentor_id, _ in ranked])
+
+@router.get("/mentors/recommended", response_model=List[MentorListItem])
+async def get_recommended_mentors(
+    k: int = Query(
+        10, ge=1, le=settings.MENTORS_MAX_PAGE_SIZE, description="Number of results"
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Mentors ranked by overlap with the mentee's interests"""
+    # Only mentees can view mentors list
+    if current_user.role != "mentee":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only mentees can view mentors list"
+        )
+    
+    interests = (
+        db.query(Skill.key)
+        .join(MenteeInterest, MenteeInterest.skill_id == Skill.id)
+        .filter(MenteeInterest.mentee_id == current_user.id)
+    )
+    interest_keys = [key for (key,) in interests]
+    ranked = mentor_recommender.recommend(db, current_user.id, interest_keys)
+    return mentors_in_order(db, [mentor_id for mentor_id, _ in ranked[:k]])
+
+@router.get("/mentors/facets", response_model=List[SkillFacet])
+async def get_skill_facets(
+    response: Response,
+    tech_stack: Optional[str] = Query(
+        None, description="Only count mentors with this skill"
+    ),
+    skill: Optional[str] = Query(
+        None, description="Only count mentors with this skill (alias for tech_stack)"
+    ),
+    skills: Optional[str] = Query(
+        None, description="Only count mentors matching this skill expression"
+    ),
+    search: Optional[str] = Query(
+        None, description="Only count mentors matching this search"
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, description="Return only the most common skills"
+    ),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Number of mentors per skill, for building skill filters"""
+    # Only mentees can view mentors list
+    if current_user.role != "mentee":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only mentees can view mentors list"
+        )
+    
+    # Count skill rows of the mentors the same filters would list
+    mentor_count = func.count(MentorSkill.mentor_id)
+    query = (
+        db.query(Skill.name, mentor_count)
+        .join(MentorSkill, MentorSkill.skill_id == Skill.id)
+        .join(User, User.id == MentorSkill.mentor_id)
+        .filter(User.role == "mentor")
+    )
+    filter_skill = tech_stack or skill
+    if filter_skill:
+        resolved_key = resolve_skill_param(db, response, filter_skill)
+        if resolved_key is None:
+            return []
+        query = query.filter(skill_query_condition(("skill", resolved_key)))
+    if skills:
+        query = query.filter(skill_query_condition(parse_skills_param(skills)))
+    if search:
+        matches = search_matches(db, search)
+        if matches is None:
+            query = query.filter(search_filter(search))
+        else:
+            query = query.join(matches, matches.c.mentor_id == User.id)
+    
+    query = query.group_by(Skill.id).order_by(mentor_count.desc(), Skill.key)
+    if limit is not None:
+        query = query.limit(limit)
+    return [{"skill": name, "count": count} for name, count in query]
+
+@router.get("/mentors/suggest", response_model=MentorSuggestions)
+async def suggest_mentors(
+    prefix: str = Query(..., min_length=1, description="What has been typed so far"),
+    limit: int = Query(8, ge=1, le=20, description="Completions of each kind"),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """Skill and mentor name completions for a search box"""
+    # Only mentees can view mentors list
+    if current_user.role != "mentee":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only mentees can view mentors list"
+        )
+    
+    skills, mentors = suggestion_index.suggest(db, prefix, limit)
+    return {
+        "skills": skills,
+        "mentors": [{"id": mentor_id, "name": name} for mentor_id, name in mentors]
+    }
 
 @router.get("/mentors/{mentor_id}", response_model=MentorListItem)
 async def get_mentor_by_id(
     mentor_id: int,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma separated fields to return, e.g. 'id,name'"
+    ),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get specific mentor by ID"""
@@ -110,33 +442,16 @@ async def get_mentor_by_id(
             detail="Only mentees can view mentor details"
         )
     
-    mentor = db.query(User).filter(User.id == mentor_id, User.role == "mentor").first()
+    field_list = parse_mentor_fields(fields)
+    mentor = db.query(User).filter(User.id == mentor_id, User.role == "mentor").options(
+        *mentor_load_options(field_list)
+    ).first()
     if not mentor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Mentor not found"
         )
     
-    tech_stack_list = None
-    if mentor.tech_stack:
-        try:
-            tech_stack_list = json.loads(mentor.tech_stack)
-        except json.JSONDecodeError:
-            tech_stack_list = []
-    
-    profile_image_url = get_profile_image_url(mentor)
-    
-    # Create profile data according to API spec
-    profile_data = {
-        "name": mentor.name,
-        "bio": mentor.bio,
-        "imageUrl": profile_image_url,
-        "skills": tech_stack_list
-    }
-    
-    return MentorListItem(
-        id=mentor.id,
-        email=mentor.email,
-        role=mentor.role,
-        profile=profile_data
-    )
+    if field_list is not None:
+        return sparse_response(to_sparse_mentor(mentor, field_list), response)
+    return user_item(mentor)
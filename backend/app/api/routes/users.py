@@ -1,46 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+    UploadFile,
+    File,
+    Response,
+)
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-import json
-import base64
+from typing import Optional
+import binascii
 
 from app.database import get_db, User
 from app.schemas import UserProfile, UserProfileUpdate
-from app.core.auth import get_current_user
+from app.core.auth import Principal, get_current_principal, get_current_user
+from app.core.config import settings
+from app.core.http_cache import http_date, is_not_modified
+from app.core.image_store import (
+    DEFAULT_MIME_TYPE,
+    ImageDimensionsTooLarge,
+    ImageTooLarge,
+    image_store,
+    set_profile_image,
+    sniff_image_type,
+)
+from app.core.image_variants import image_variants, variant_mime_type
+from app.core.mentor_search import index_mentor
+from app.core.serializers import own_profile_item, profile_image_url
+from app.core.skill_index import skill_index
+from app.core.skills import (
+    mentor_skill_labels,
+    set_mentee_interests,
+    set_mentor_skills,
+    skill_labels,
+)
+from app.core.suggestions import suggestion_index
+from app.core.tfidf_index import mentor_tfidf
 
 router = APIRouter()
 
-def get_profile_image_url(user: User) -> str:
-    """Get profile image URL for user"""
-    return f"/images/{user.role}/{user.id}"
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 @router.get("/me", response_model=UserProfile)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user profile"""
-    skills = None
-    if current_user.tech_stack:
-        try:
-            skills = json.loads(current_user.tech_stack)
-        except json.JSONDecodeError:
-            skills = []
-    
-    profile_image_url = get_profile_image_url(current_user)
-    
-    # Create profile data according to API spec
-    profile_data = {
-        "name": current_user.name,
-        "bio": current_user.bio,
-        "imageUrl": profile_image_url,
-        "skills": skills
-    }
-    
-    return UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        role=current_user.role,
-        profile=profile_data
-    )
+    return own_profile_item(current_user)
 
 @router.put("/profile", response_model=UserProfile)
 async def update_current_user_profile(
@@ -53,6 +62,7 @@ async def update_current_user_profile(
     if (profile_update.name is None and 
         profile_update.bio is None and 
         profile_update.skills is None and
+        profile_update.interests is None and
         profile_update.image is None and
         profile_update.role is None):
         raise HTTPException(
@@ -74,56 +84,76 @@ async def update_current_user_profile(
             detail={"error": "Role cannot be changed"}
         )
     
+    skill_keys = None
     if profile_update.skills is not None:
         # Only mentors can have skills
         if current_user.role == "mentor":
-            current_user.tech_stack = json.dumps(profile_update.skills)
+            skill_keys = set_mentor_skills(db, current_user, profile_update.skills)
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "Only mentors can have skills"}
             )
     
+    if profile_update.interests is not None:
+        # Only mentees declare interests
+        if current_user.role == "mentee":
+            set_mentee_interests(db, current_user, profile_update.interests)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Only mentees can have interests"}
+            )
+    
     # Handle base64 image upload
     if profile_update.image is not None:
         try:
-            # Decode base64 image
-            image_data = base64.b64decode(profile_update.image)
-            current_user.profile_image = image_data
-            current_user.profile_image_filename = "profile.jpg"  # Default filename
-        except Exception:
+            # Decode base64 image straight into the store, a chunk at a time
+            with image_store.writer(
+                max_bytes=settings.MAX_PROFILE_IMAGE_BYTES,
+                max_pixels=settings.MAX_PROFILE_IMAGE_PIXELS,
+            ) as writer:
+                writer.write_base64(profile_update.image)
+                if writer.size == 0:
+                    raise binascii.Error("Empty image")
+                digest = writer.commit()
+        except ImageDimensionsTooLarge:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Image dimensions are too large"}
+            )
+        except ImageTooLarge:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Image size must be less than 1MB"}
+            )
+        except (binascii.Error, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={"error": "Invalid base64 image data"}
             )
+        # Default filename
+        set_profile_image(current_user, digest, writer.head, "profile.jpg")
+        image_variants.schedule(
+            current_user.profile_image_hash, current_user.profile_image_mime
+        )
     
+    index_mentor(db, current_user)
     db.commit()
     db.refresh(current_user)
     
-    # Return updated profile
-    skills = None
-    if current_user.tech_stack:
-        try:
-            skills = json.loads(current_user.tech_stack)
-        except json.JSONDecodeError:
-            skills = []
-    
-    profile_image_url = get_profile_image_url(current_user)
-    
-    # Create profile data according to API spec
-    profile_data = {
-        "name": current_user.name,
-        "bio": current_user.bio,
-        "imageUrl": profile_image_url,
-        "skills": skills
-    }
+    if skill_keys is not None:
+        skill_index.update_mentor(current_user.id, skill_keys)
+    if current_user.role == "mentor":
+        mentor_tfidf.update_mentor(
+            current_user.id, current_user.bio, mentor_skill_labels(current_user)
+        )
+        suggestion_index.update_mentor(
+            current_user.id, current_user.name, mentor_skill_labels(current_user)
+        )
     
-    return UserProfile(
-        id=current_user.id,
-        email=current_user.email,
-        role=current_user.role,
-        profile=profile_data
-    )
+    # Return updated profile
+    return own_profile_item(current_user)
 
 @router.post("/me/profile-image")
 async def upload_profile_image(
@@ -139,19 +169,33 @@ async def upload_profile_image(
             detail="Only .jpg and .png files are allowed"
         )
     
-    # Read file content
-    file_content = await file.read()
-    
-    # Validate file size (max 1MB)
-    if len(file_content) > 1024 * 1024:  # 1MB
+    # Stream into the content-addressed image store, stopping as soon as
+    # the file exceeds the size limit (max 1MB)
+    try:
+        with image_store.writer(
+            max_bytes=settings.MAX_PROFILE_IMAGE_BYTES,
+            max_pixels=settings.MAX_PROFILE_IMAGE_PIXELS,
+        ) as writer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                writer.write(chunk)
+            digest = writer.commit()
+    except ImageDimensionsTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image dimensions are too large"
+        )
+    except ImageTooLarge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File size must be less than 1MB"
         )
     
-    # Store image in database
-    current_user.profile_image = file_content
-    current_user.profile_image_filename = file.filename
+    set_profile_image(
+        current_user, digest, writer.head, file.filename, file.content_type
+    )
+    image_variants.schedule(
+        current_user.profile_image_hash, current_user.profile_image_mime
+    )
     
     db.commit()
     
@@ -161,7 +205,9 @@ async def upload_profile_image(
 async def get_profile_image(
     role: str,
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    size: Optional[str] = Query(None, description="Variant size in px, or 'original'"),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get profile image"""
@@ -172,23 +218,82 @@ async def get_profile_image(
             detail="Role must be either 'mentor' or 'mentee'"
         )
     
-    # Get user
-    user = db.query(User).filter(User.id == user_id, User.role == role).first()
+    # Validate requested variant
+    variant_size = None
+    if size is not None and size != "original":
+        if not size.isdigit() or int(size) not in settings.IMAGE_VARIANT_SIZES:
+            allowed = ", ".join(
+                [str(s) for s in settings.IMAGE_VARIANT_SIZES] + ["original"]
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Size must be one of: {allowed}"
+            )
+        variant_size = int(size)
+    
+    # Get user, without touching any image bytes
+    user = (
+        db.query(User.profile_image_hash, User.profile_image_mime, User.updated_at)
+        .filter(User.id == user_id, User.role == role)
+        .first()
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Return image data
-    if user.profile_image:
-        return Response(content=user.profile_image, media_type="image/jpeg")
-    else:
-        # Return a default placeholder or 404
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile image not found"
+    if user.profile_image_hash:
+        digest = user.profile_image_hash
+        media_type = user.profile_image_mime or DEFAULT_MIME_TYPE
+        # Images that can't be resized (or failed to) are served at their original size
+        if variant_size is not None and (
+            variant_mime_type(media_type) is None
+            or image_variants.has_failed(digest, variant_size)
+        ):
+            variant_size = None
+        
+        # Stored images never change, so the content hash is a strong validator
+        etag = f'"{digest}-{variant_size}"' if variant_size else f'"{digest}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"private, max-age={settings.IMAGE_CACHE_MAX_AGE}"
+        }
+        if user.updated_at is not None:
+            headers["Last-Modified"] = http_date(user.updated_at)
+        
+        if is_not_modified(request, etag, user.updated_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        # Serve the stored file directly from disk
+        if image_store.exists(digest):
+            if variant_size:
+                try:
+                    # Generated on first request for images that predate variants
+                    path = await image_variants.ensure(digest, variant_size, media_type)
+                    return FileResponse(
+                        path, media_type=variant_mime_type(media_type), headers=headers
+                    )
+                except Exception:
+                    # Images Pillow can't decode are served as uploaded
+                    headers["ETag"] = f'"{digest}"'
+            return FileResponse(
+                image_store.path_for(digest), media_type=media_type, headers=headers
+            )
+    
+    # Images not yet moved out by the migration are still served from the row
+    legacy_image = db.query(User.profile_image).filter(User.id == user_id).scalar()
+    if legacy_image:
+        return Response(
+            content=legacy_image,
+            media_type=sniff_image_type(legacy_image[:16]) or "image/jpeg",
         )
+    
+    # Return a default placeholder or 404
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Profile image not found"
+    )
 
 # Alias endpoint for tests that expect /users/me/profile instead of /me
 @router.get("/users/me/profile", response_model=UserProfile)
@@ -196,20 +301,15 @@ async def get_current_user_profile_alias(
     current_user: User = Depends(get_current_user)
 ):
     """Get current user profile (alias endpoint)"""
-    tech_stack = None
-    if current_user.tech_stack:
-        try:
-            tech_stack = json.loads(current_user.tech_stack)
-        except json.JSONDecodeError:
-            tech_stack = []
+    tech_stack = skill_labels(current_user)
     
-    profile_image_url = get_profile_image_url(current_user)
+    image_url = profile_image_url(current_user)
     
     # Create profile data for tests that expect it
     profile_data = {
         "bio": current_user.bio,
         "tech_stack": tech_stack,
-        "profile_image_url": profile_image_url
+        "profile_image_url": image_url
     }
     
     # Return user data with profile field for test compatibility
@@ -220,7 +320,7 @@ async def get_current_user_profile_alias(
         role=current_user.role,
         bio=current_user.bio,
         tech_stack=tech_stack,
-        profile_image_url=profile_image_url,
+        profile_image_url=image_url,
         profile=profile_data,
         created_at=current_user.created_at,
         updated_at=current_user.updated_at
@@ -259,34 +359,41 @@ async def update_current_user_profile_alias(
             detail="Role cannot be changed"
         )
     
+    skill_keys = None
     if profile_update.tech_stack is not None:
         # Only mentors can have tech stack
         if current_user.role == "mentor":
-            current_user.tech_stack = json.dumps(profile_update.tech_stack)
+            skill_keys = set_mentor_skills(db, current_user, profile_update.tech_stack)
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Only mentors can have tech stack"
             )
     
+    index_mentor(db, current_user)
     db.commit()
     db.refresh(current_user)
     
+    if skill_keys is not None:
+        skill_index.update_mentor(current_user.id, skill_keys)
+    if current_user.role == "mentor":
+        mentor_tfidf.update_mentor(
+            current_user.id, current_user.bio, mentor_skill_labels(current_user)
+        )
+        suggestion_index.update_mentor(
+            current_user.id, current_user.name, mentor_skill_labels(current_user)
+        )
+    
     # Return updated profile
-    tech_stack = None
-    if current_user.tech_stack:
-        try:
-            tech_stack = json.loads(current_user.tech_stack)
-        except json.JSONDecodeError:
-            tech_stack = []
+    tech_stack = skill_labels(current_user)
     
-    profile_image_url = get_profile_image_url(current_user)
+    image_url = profile_image_url(current_user)
     
     # Create profile data for tests that expect it
     profile_data = {
         "bio": current_user.bio,
         "tech_stack": tech_stack,
-        "profile_image_url": profile_image_url
+        "profile_image_url": image_url
     }
     
     return UserProfile(
@@ -296,7 +403,7 @@ async def update_current_user_profile_alias(
         role=current_user.role,
         bio=current_user.bio,
         tech_stack=tech_stack,
-        profile_image_url=profile_image_url,
+        profile_image_url=image_url,
         profile=profile_data,
         created_at=current_user.created_at,
         updated_at=current_user.updated_at
@@ -0,0 +1,178 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.password_pool import PasswordHashPool, password_pool
+
+
+class TokenBucketRegistry:
+    """Per-key token buckets, bounded to the most recently seen keys"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> float:
+        """Consume one token for ``key``; return 0 or seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                tokens, updated = bucket
+                bucket[0] = min(float(self.burst), tokens + (now - updated) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate if self.rate > 0 else 60.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class HashAdmissionController:
+    """Admission control in front of bcrypt work on the password pool.
+
+    Requests are shed before any hashing happens: per-client-IP and per-email
+    token buckets and a queue latency budget answer 429, and the global
+    concurrency cap answers 503. Both carry a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        pool: PasswordHashPool,
+        enabled: bool,
+        max_concurrent: int,
+        latency_budget_ms: int,
+        ip_rate: float,
+        ip_burst: int,
+        email_rate: float,
+        email_burst: int,
+        max_tracked_keys: int,
+    ):
+        self.pool = pool
+        self.enabled = enabled
+        self.max_concurrent = max_concurrent
+        self.latency_budget = latency_budget_ms / 1000
+        self.ip_buckets = TokenBucketRegistry(ip_rate, ip_burst, max_tracked_keys)
+        self.email_buckets = TokenBucketRegistry(
+            email_rate, email_burst, max_tracked_keys
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = {
+            "client_ip": 0,
+            "email": 0,
+            "latency_budget": 0,
+            "concurrency": 0,
+        }
+
+    def _reject(
+        self, reason: str, status_code: int, retry_after: float
+    ) -> HTTPException:
+        with self._lock:
+            self._rejected[reason] += 1
+        if status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            message = "Authentication service is busy, please retry later"
+        else:
+            message = "Too many authentication attempts, please retry later"
+        return HTTPException(
+            status_code=status_code,
+            detail={"error": message},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def _check(self, email: Optional[str], client_ip: Optional[str]) -> None:
+        if client_ip:
+            retry_after = self.ip_buckets.take(client_ip)
+            if retry_after:
+                raise self._reject(
+                    "client_ip", status.HTTP_429_TOO_MANY_REQUESTS, retry_after
+                )
+        if email:
+            retry_after = self.email_buckets.take(email.lower())
+            if retry_after:
+                raise self._reject(
+                    "email", status.HTTP_429_TOO_MANY_REQUESTS, retry_after
+                )
+
+        estimated_wait = self.pool.estimated_wait()
+        if estimated_wait > self.latency_budget:
+            raise self._reject(
+                "latency_budget",
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                estimated_wait - self.latency_budget,
+            )
+
+        with self._lock:
+            full = self._in_flight >= self.max_concurrent
+            if not full:
+                self._in_flight += 1
+                self._admitted += 1
+        if full:
+            raise self._reject(
+                "concurrency", status.HTTP_503_SERVICE_UNAVAILABLE, estimated_wait
+            )
+
+    @asynccontextmanager
+    async def admit(self, email: Optional[str] = None, client_ip: Optional[str] = None):
+        """Admit one unit of password-hashing work or raise 429/503"""
+        if not self.enabled:
+            yield
+            return
+
+        self._check(email, client_ip)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": self._in_flight,
+                "max_concurrent": self.max_concurrent,
+                "admitted": self._admitted,
+                "rejected": dict(self._rejected),
+            }
+
+    def reset(self) -> None:
+        """Forget all bucket state and counters"""
+        self.ip_buckets.reset()
+        self.email_buckets.reset()
+        with self._lock:
+            self._admitted = 0
+            self._rejected = {key: 0 for key in self._rejected}
+
+
+hash_admission = HashAdmissionController(
+    pool=password_pool,
+    enabled=settings.AUTH_ADMISSION_ENABLED,
+    max_concurrent=settings.AUTH_MAX_CONCURRENT_HASHES,
+    latency_budget_ms=settings.AUTH_HASH_LATENCY_BUDGET_MS,
+    ip_rate=settings.AUTH_IP_RATE_PER_SECOND,
+    ip_burst=settings.AUTH_IP_BURST,
+    email_rate=settings.AUTH_EMAIL_RATE_PER_SECOND,
+    email_burst=settings.AUTH_EMAIL_BURST,
+    max_tracked_keys=settings.AUTH_ADMISSION_MAX_KEYS,
+)
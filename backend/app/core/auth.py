@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -7,6 +8,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.core.token_cache import token_cache, token_versions
 from app.database import get_db, User
 
 # Password hashing
@@ -15,6 +18,14 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # JWT token scheme
 security = HTTPBearer(auto_error=False)  # Don't auto-error on missing auth
 
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller built from token claims, without loading the users row"""
+    id: int
+    email: Optional[str]
+    name: Optional[str]
+    role: Optional[str]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -23,6 +34,14 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop"""
+    return await password_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -49,6 +68,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return payload"""
+    # Tokens verified earlier skip signature and claim checks until they expire
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(
             token, 
@@ -57,43 +81,91 @@ def verify_token(token: str) -> Optional[dict]:
             audience="mentor-mentee-users",
             issuer="mentor-mentee-app"
         )
-        return payload
     except JWTError:
         return None
+    
+    token_cache.put(token, payload)
+    return payload
 
-def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail={"error": "Could not validate credentials"},
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _token_payload(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
+    """Verify bearer credentials and return claims with an integer subject"""
     # Check if credentials are provided
     if credentials is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    
+    payload = verify_token(credentials.credentials)
+    if payload is None:
+        raise _credentials_exception()
     
     try:
-        payload = verify_token(credentials.credentials)
-        if payload is None:
-            raise credentials_exception
-        
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
+        payload["sub"] = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise _credentials_exception()
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None:
-        raise credentials_exception
+    return payload
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user"""
+    payload = _token_payload(credentials)
+    
+    user = db.query(User).filter(User.id == payload["sub"]).first()
+    if user is None or payload.get("ver", 0) != user.token_version:
+        raise _credentials_exception()
     
+    token_versions.put(user.id, user.token_version)
     return user
 
+def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Get current caller from token claims.
+    
+    Only the user's token version is checked against the database, and only
+    once it is older than PRINCIPAL_MAX_STALENESS_SECONDS. Routes that modify
+    the user's own row should depend on get_current_user instead.
+    """
+    payload = _token_payload(credentials)
+    user_id = payload["sub"]
+    
+    if payload.get("role") is None:
+        # Token predates role claims; fall back to the users row
+        user = get_current_user(credentials, db)
+        return Principal(id=user.id, email=user.email, name=user.name, role=user.role)
+    
+    version = token_versions.get(user_id)
+    if version is None:
+        version = db.query(User.token_version).filter(User.id == user_id).scalar()
+        if version is None:
+            raise _credentials_exception()
+        token_versions.put(user_id, version)
+    
+    if payload.get("ver", 0) != version:
+        raise _credentials_exception()
+    
+    return Principal(
+        id=user_id,
+        email=payload.get("email"),
+        name=payload.get("name"),
+        role=payload["role"]
+    )
+
+def revoke_user_tokens(db: Session, user: User) -> None:
+    """Invalidate every token issued to user so far"""
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    token_versions.invalidate(user.id)
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password"""
     user = db.query(User).filter(User.email == email).first()
@@ -102,3 +174,14 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     if not verify_password(password, user.hashed_password):
         return None
     return user
+
+async def authenticate_user_async(
+    db: Session, email: str, password: str
+) -> Optional[User]:
+    """Authenticate user, running the bcrypt check on the hashing pool"""
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
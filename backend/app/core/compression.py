@@ -0,0 +1,217 @@
+import threading
+import time
+import zlib
+from typing import Iterable, Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Supported encodings, most preferred first
+ENCODINGS = ("br", "gzip")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The supported encoding the client prefers, from its Accept-Encoding header"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    default = weights.get("*", 0.0)
+    best = None
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, default)
+        if weight > 0 and (best is None or weight > weights.get(best, default)):
+            best = encoding
+    return best
+
+
+class CompressionStats:
+    """Bytes saved and CPU time spent per encoding, for tuning the levels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(
+        self,
+        encoding: str,
+        bytes_in: int,
+        bytes_out: int,
+        cpu_seconds: float,
+        finished: bool,
+    ) -> None:
+        with self._lock:
+            totals = self._totals[encoding]
+            totals["bytes_in"] += bytes_in
+            totals["bytes_out"] += bytes_out
+            totals["cpu_seconds"] += cpu_seconds
+            if finished:
+                totals["responses"] += 1
+
+    def skipped(self) -> None:
+        """Count a compressible response left alone for being under the minimum size"""
+        with self._lock:
+            self._skipped_small += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            encodings = {}
+            for encoding, totals in self._totals.items():
+                ratio = cpu_us_per_kb = None
+                if totals["bytes_in"]:
+                    ratio = round(totals["bytes_out"] / totals["bytes_in"], 4)
+                    cpu_us = totals["cpu_seconds"] * 1e6
+                    cpu_us_per_kb = round(cpu_us / (totals["bytes_in"] / 1024), 2)
+                encodings[encoding] = {
+                    **totals, "ratio": ratio, "cpu_us_per_kb": cpu_us_per_kb
+                }
+            return {"encodings": encodings, "skipped_small": self._skipped_small}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals = {
+                encoding: {
+                    "responses": 0,
+                    "bytes_in": 0,
+                    "bytes_out": 0,
+                    "cpu_seconds": 0.0,
+                }
+                for encoding in ENCODINGS
+            }
+            self._skipped_small = 0
+
+
+compression_stats = CompressionStats()
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder that records its CPU time"""
+
+    def __init__(
+        self,
+        encoding: str,
+        gzip_level: int,
+        brotli_quality: int,
+        stats: CompressionStats,
+    ):
+        self.encoding = encoding
+        self.stats = stats
+        if encoding == "gzip":
+            # 31: gzip header
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        else:
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk, flushing so the client can decode it right away"""
+        started = time.thread_time()
+        if self.encoding == "gzip":
+            mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+            output = self._gzip.compress(data) + self._gzip.flush(mode)
+        else:
+            output = self._brotli.process(data)
+            output += self._brotli.finish() if final else self._brotli.flush()
+        elapsed = time.thread_time() - started
+        self.stats.record(self.encoding, len(data), len(output), elapsed, final)
+        return output
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip, as the client accepts.
+
+    Only responses whose media type is in ``content_types`` are compressed,
+    which leaves images (already compressed) alone. Complete bodies under
+    ``minimum_size`` bytes are sent as they are; streamed bodies are
+    compressed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        content_types: Iterable[str],
+        gzip_level: int,
+        brotli_quality: int,
+        stats: CompressionStats = compression_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats
+
+    def _compressible(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return (
+            media_type in self.content_types
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if compressor is not None:
+                final = not message.get("more_body", False)
+                body = compressor.compress(message.get("body", b""), final)
+                await send({**message, "body": body})
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if message["type"] != "http.response.body":
+                passthrough = True
+            elif not self._compressible(headers):
+                passthrough = True
+            elif not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                self.stats.skipped()
+            else:
+                headers.add_vary_header("Accept-Encoding")
+                passthrough = encoding is None
+            if passthrough:
+                await send(start_message)
+                await send(message)
+                return
+
+            compressor = _Compressor(
+                encoding, self.gzip_level, self.brotli_quality, self.stats
+            )
+            body = compressor.compress(body, not more_body)
+            headers["Content-Encoding"] = encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, compressing_send)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
@@ -7,6 +7,68 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     DATABASE_URL: str = "sqlite:///./mentor_mentee.db"
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+    UPLOAD_DIR: str = "uploads"
+    # Content-addressed profile images; must not be under UPLOAD_DIR, which is
+    # served without authentication
+    IMAGE_STORE_DIR: str = "image_store"
+    MAX_PROFILE_IMAGE_BYTES: int = 1024 * 1024
+    # Largest width x height accepted; a small file can decode to a huge bitmap
+    MAX_PROFILE_IMAGE_PIXELS: int = 4096 * 4096
+    # Bodies above this are rejected before parsing (fits a base64 encoded image)
+    MAX_REQUEST_BODY_BYTES: int = 2 * 1024 * 1024
+    # Seconds browsers may reuse a profile image before revalidating it
+    IMAGE_CACHE_MAX_AGE: int = 300
+    # Square bounding boxes (px) of the resized profile image variants
+    IMAGE_VARIANT_SIZES: List[int] = [64, 256]
+    # Image resizing worker processes (defaults to the number of CPU cores)
+    IMAGE_WORKERS: Optional[int] = None
+    # Page sizes for cursor pagination of the mentor list
+    MENTORS_PAGE_SIZE: int = 20
+    MENTORS_MAX_PAGE_SIZE: int = 100
+    # Lowest trigram similarity at which a misspelled skill filter is resolved
+    SKILL_FUZZY_MIN_SIMILARITY: float = 0.3
+    # Mentees whose mentor recommendations are kept cached
+    RECOMMENDATION_CACHE_SIZE: int = 10000
+    # Seconds a cached ranking may be reused; bounds how long writes made by
+    # other workers or scripts (skills, interests, match requests) go unseen
+    RECOMMENDATION_MAX_AGE_SECONDS: float = 60.0
+    # Seconds before the in-memory skill index is reloaded from mentor_skills
+    SKILL_INDEX_MAX_AGE_SECONDS: float = 60.0
+    # Minimum seconds between rebuilds of the TF-IDF search matrix
+    TFIDF_REBUILD_SECONDS: float = 2.0
+    # X-API-Key required by the /api/export endpoints (unset disables them)
+    EXPORT_API_KEY: Optional[str] = None
+    # Rows fetched per database round trip while streaming an export
+    EXPORT_BATCH_SIZE: int = 1000
+    # Response compression: responses of these media types are brotli/gzip
+    # encoded once they reach the minimum size
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json", "application/x-ndjson", "application/msgpack",
+        "text/html", "text/plain", "text/css", "application/javascript"
+    ]
+    # Higher levels trade CPU time (see /metrics) for smaller responses
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # X-API-Key required by /metrics (unset disables it)
+    METRICS_API_KEY: Optional[str] = None
+    # Password hashing worker threads (defaults to the number of CPU cores)
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    # Admission control for signup/login password hashing
+    AUTH_ADMISSION_ENABLED: bool = True
+    AUTH_MAX_CONCURRENT_HASHES: int = 64
+    AUTH_HASH_LATENCY_BUDGET_MS: int = 2000
+    AUTH_IP_RATE_PER_SECOND: float = 5.0
+    AUTH_IP_BURST: int = 30
+    AUTH_EMAIL_RATE_PER_SECOND: float = 0.2
+    AUTH_EMAIL_BURST: int = 10
+    AUTH_ADMISSION_MAX_KEYS: int = 10000
+    # Cache of already-verified JWTs, keyed by token digest
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_SIZE: int = 10000
+    # How long a user's token version may be trusted before re-reading it
+    PRINCIPAL_MAX_STALENESS_SECONDS: float = 30.0
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,126 @@
+from contextvars import ContextVar
+from typing import Dict
+
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset([MSGPACK_MEDIA_TYPE, "application/x-msgpack"])
+
+# "msgpack" while handling a request whose Accept header prefers MessagePack
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def _accept_weights(accept: str) -> Dict[str, float]:
+    weights = {}
+    for part in accept.split(","):
+        media_type, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[media_type.strip().lower()] = weight
+    return weights
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an Accept header ranks MessagePack above JSON"""
+    weights = _accept_weights(accept)
+    msgpack_weight = max(
+        weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES
+    )
+    fallback = weights.get("application/*", weights.get("*/*", 0.0))
+    json_weight = weights.get("application/json", fallback)
+    return msgpack_weight > 0 and msgpack_weight >= json_weight
+
+
+class MessagePackMiddleware:
+    """Let clients exchange MessagePack instead of JSON.
+
+    Request bodies sent as ``application/msgpack`` are re-encoded as JSON
+    before FastAPI parses them, so routes and schemas are unchanged. A
+    request whose Accept header prefers MessagePack sets ``response_format``
+    for the app's default response class, which then encodes the same
+    content as MessagePack. Error responses stay JSON.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        if content_type in MSGPACK_MEDIA_TYPES:
+            body = await self._read_body(receive)
+            try:
+                body = orjson.dumps(msgpack.unpackb(body))
+            except (ValueError, TypeError, msgpack.UnpackException):
+                response = JSONResponse(
+                    status_code=400, content={"error": "Invalid request data"}
+                )
+                await response(scope, receive, send)
+                return
+            request_headers = [
+                (name, value)
+                for name, value in scope["headers"]
+                if name not in (b"content-type", b"content-length")
+            ]
+            request_headers.append((b"content-type", b"application/json"))
+            request_headers.append((b"content-length", str(len(body)).encode()))
+            scope = {**scope, "headers": request_headers}
+            receive = self._replay(body, receive)
+
+        async def vary_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(raw=list(message["headers"]))
+                content_type = response_headers.get("content-type", "")
+                media_type = content_type.partition(";")[0].strip().lower()
+                # The body's format depends on Accept, so caches must key on it
+                if media_type in MSGPACK_MEDIA_TYPES | {"application/json"}:
+                    response_headers.add_vary_header("Accept")
+                    message = {**message, "headers": response_headers.raw}
+            await send(message)
+
+        wants_msgpack = prefers_msgpack(headers.get("accept", ""))
+        token = response_format.set("msgpack" if wants_msgpack else "json")
+        try:
+            await self.app(scope, receive, vary_send)
+        finally:
+            response_format.reset(token)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Receive) -> Receive:
+        """A receive that yields ``body`` once, then defers to the real one"""
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay
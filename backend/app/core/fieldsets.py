@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+
+from app.core.serializers import NegotiatedResponse
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    groups: Optional[Dict[str, Sequence[str]]] = None,
+) -> Optional[List[str]]:
+    """Field names requested by a ``fields=a,b`` parameter, in ``allowed`` order.
+
+    None means the parameter was not given and every field is wanted.
+    ``groups`` maps a name to several fields (e.g. ``profile``).
+    """
+    if fields is None:
+        return None
+    groups = groups or {}
+    requested = set()
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        if name in groups:
+            requested.update(groups[name])
+        elif name in allowed:
+            requested.add(name)
+        else:
+            choices = ", ".join([*allowed, *groups])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field '{name}'; fields can be {choices}"
+            )
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields must name at least one field"
+        )
+    return [name for name in allowed if name in requested]
+
+
+def sparse_response(content: Any, response: Response) -> NegotiatedResponse:
+    """Return partial objects as-is, skipping the response model.
+
+    Keeps any headers already set on the endpoint's ``response``, which
+    FastAPI would otherwise drop when a Response is returned directly.
+    """
+    return NegotiatedResponse(content=content, headers=dict(response.headers))
@@ -0,0 +1,198 @@
+import binascii
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from app.core.config import settings
+
+# Magic numbers of the image formats we accept
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+# Bytes sniffed for the mime type
+HEAD_SIZE = 16
+
+BASE64_CHUNK_SIZE = 64 * 1024  # Multiple of 4, so chunks decode independently
+
+
+class ImageTooLarge(ValueError):
+    pass
+
+
+class ImageDimensionsTooLarge(ImageTooLarge):
+    pass
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Detect the image mime type from the first bytes of a file"""
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class ImageStore:
+    """Content-addressed file store for profile images.
+
+    Each image is written once, named by the SHA-256 of its bytes and fanned
+    out into two-character subdirectories (``ab/abcdef...``). Identical
+    uploads share one file, and a file never changes once written.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def exists(self, digest: Optional[str]) -> bool:
+        return bool(digest) and os.path.exists(self.path_for(digest))
+
+    def variant_path_for(self, digest: str, size: int) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}-{size}")
+
+    def variant_exists(self, digest: str, size: int) -> bool:
+        return os.path.exists(self.variant_path_for(digest, size))
+
+    def writer(
+        self, max_bytes: Optional[int] = None, max_pixels: Optional[int] = None
+    ) -> "ImageWriter":
+        """Open an incremental writer for one image"""
+        return ImageWriter(self, max_bytes, max_pixels)
+
+    def save(self, data: bytes) -> str:
+        """Store ``data`` and return its content hash"""
+        with self.writer() as writer:
+            writer.write(data)
+            return writer.commit()
+
+
+class ImageWriter:
+    """Streams one image into the store, hashing it as it is written.
+
+    Bytes go to a temporary file and are moved to their content-addressed
+    path on ``commit``, so readers never see partial images. Writing more
+    than ``max_bytes`` raises ImageTooLarge right away and the temporary
+    file is removed when the context exits. ``commit`` raises
+    ImageDimensionsTooLarge for images of more than ``max_pixels``, read
+    from the image header without decoding it.
+    """
+
+    def __init__(
+        self,
+        store: ImageStore,
+        max_bytes: Optional[int] = None,
+        max_pixels: Optional[int] = None,
+    ):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.size = 0
+        self.head = b""
+        self._hash = hashlib.sha256()
+        os.makedirs(store.root, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.root, prefix=".tmp-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise ImageTooLarge(f"Image exceeds {self.max_bytes} bytes")
+        if len(self.head) < HEAD_SIZE:
+            self.head = (self.head + chunk[:HEAD_SIZE])[:HEAD_SIZE]
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def write_base64(self, encoded: str) -> None:
+        """Decode base64 text a chunk at a time, enforcing the size limit early"""
+        # Line-wrapped (MIME style) input is unwrapped first
+        if "\n" in encoded or "\r" in encoded or " " in encoded:
+            encoded = "".join(encoded.split())
+        # Refuse oversized payloads before decoding anything
+        decoded_size = len(encoded) // 4 * 3 - encoded[-2:].count("=")
+        if self.max_bytes is not None and decoded_size > self.max_bytes:
+            raise ImageTooLarge(f"Image exceeds {self.max_bytes} bytes")
+        if len(encoded) % 4:
+            raise binascii.Error("Incorrect padding")
+        for start in range(0, len(encoded), BASE64_CHUNK_SIZE):
+            chunk = encoded[start:start + BASE64_CHUNK_SIZE]
+            self.write(binascii.a2b_base64(chunk, strict_mode=True))
+
+    def _check_dimensions(self) -> None:
+        from PIL import Image
+
+        try:
+            with Image.open(self._tmp_path) as image:
+                pixels = image.width * image.height
+        except Image.DecompressionBombError:
+            pixels = None
+        except (OSError, ValueError, SyntaxError):
+            # Not an image Pillow can read; it is stored and served as uploaded
+            return
+        if pixels is None or pixels > self.max_pixels:
+            raise ImageDimensionsTooLarge(f"Image exceeds {self.max_pixels} pixels")
+
+    def commit(self) -> str:
+        """Move the written image into place and return its content hash"""
+        self._file.close()
+        if self.max_pixels is not None:
+            self._check_dimensions()
+        digest = self._hash.hexdigest()
+        path = self.store.path_for(digest)
+        if os.path.exists(path):
+            os.unlink(self._tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._tmp_path, path)
+        self._tmp_path = None
+        return digest
+
+    def abort(self) -> None:
+        self._file.close()
+        if self._tmp_path is not None and os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+        self._tmp_path = None
+
+    def __enter__(self) -> "ImageWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._tmp_path is not None:
+            self.abort()
+
+
+image_store = ImageStore(settings.IMAGE_STORE_DIR)
+
+
+def set_profile_image(
+    user,
+    digest: str,
+    head: bytes,
+    filename: Optional[str],
+    declared_type: Optional[str] = None,
+) -> None:
+    """Point ``user`` at an image already in the store"""
+    user.profile_image_hash = digest
+    user.profile_image_mime = (
+        sniff_image_type(head) or declared_type or DEFAULT_MIME_TYPE
+    )
+    user.profile_image_filename = filename
+    user.profile_image = None
+
+
+def store_profile_image(
+    user, data: bytes, filename: Optional[str], declared_type: Optional[str] = None
+) -> None:
+    """Write image bytes to the store and point ``user`` at them"""
+    set_profile_image(
+        user, image_store.save(data), data[:HEAD_SIZE], filename, declared_type
+    )
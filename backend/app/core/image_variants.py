@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.image_store import ImageStore, image_store
+
+logger = logging.getLogger(__name__)
+
+# Output format for each source type; animated GIFs are flattened to PNG
+VARIANT_FORMATS = {
+    "image/png": ("PNG", "image/png"),
+    "image/jpeg": ("JPEG", "image/jpeg"),
+    "image/gif": ("PNG", "image/png"),
+    "image/webp": ("WEBP", "image/webp"),
+}
+
+
+def variant_mime_type(source_mime: Optional[str]) -> Optional[str]:
+    """Mime type of resized variants, or None if the source can't be resized"""
+    entry = VARIANT_FORMATS.get(source_mime or "")
+    return entry[1] if entry else None
+
+
+def render_variant(
+    source_path: str, target_path: str, size: int, source_mime: str
+) -> str:
+    """Resize ``source_path`` to fit in ``size`` x ``size`` (runs in a worker)"""
+    from PIL import Image
+
+    image_format, _ = VARIANT_FORMATS[source_mime]
+    with Image.open(source_path) as image:
+        # Opening only reads the header; refuse to decode oversized bitmaps
+        max_pixels = settings.MAX_PROFILE_IMAGE_PIXELS
+        if image.width * image.height > max_pixels:
+            raise ValueError(
+                f"Image {image.width}x{image.height} exceeds {max_pixels} pixels"
+            )
+        image.thumbnail((size, size))
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(target_path), prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                image.save(tmp_file, format=image_format)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    return target_path
+
+
+class ImageVariantPool:
+    """Generates resized profile image variants on a process pool.
+
+    Resizing is CPU bound and holds the GIL, so it runs in separate
+    processes. Uploads schedule every configured size in the background;
+    a request for a variant that doesn't exist yet (for example an image
+    uploaded before variants existed) generates it on demand. Concurrent
+    requests for one variant share a single render, and images that fail
+    to render are remembered so they are not retried on every request.
+    """
+
+    def __init__(self, store: ImageStore, max_workers: Optional[int] = None):
+        self.store = store
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._renders_lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, int], Future] = {}
+        self._failed: Set[Tuple[str, int]] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that already runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, digest: str, size: int, source_mime: str) -> Future:
+        """Start rendering a variant, or join the render already under way"""
+        key = (digest, size)
+        executor = self._get_executor()
+        with self._renders_lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = executor.submit(
+                render_variant,
+                self.store.path_for(digest),
+                self.store.variant_path_for(digest, size),
+                size,
+                source_mime,
+            )
+            self._in_flight[key] = future
+        # Outside the lock: the callback runs right away if the render is already done
+        future.add_done_callback(lambda done: self._render_done(key, done))
+        return future
+
+    def _render_done(self, key: Tuple[str, int], future: Future) -> None:
+        with self._renders_lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if future.cancelled():
+                return
+            error = future.exception()
+            # A broken pool says nothing about the image itself
+            if error is not None and not isinstance(error, BrokenExecutor):
+                self._failed.add(key)
+
+    def has_failed(self, digest: str, size: int) -> bool:
+        """Whether this variant failed to render (the original is served instead)"""
+        with self._renders_lock:
+            return (digest, size) in self._failed
+
+    def schedule(self, digest: str, source_mime: Optional[str]) -> None:
+        """Generate all configured variants in the background"""
+        if variant_mime_type(source_mime) is None:
+            return
+        for size in settings.IMAGE_VARIANT_SIZES:
+            if self.store.variant_exists(digest, size) or self.has_failed(digest, size):
+                continue
+            future = self._submit(digest, size, source_mime)
+            future.add_done_callback(self._log_failure)
+
+    async def ensure(self, digest: str, size: int, source_mime: str) -> str:
+        """Return the path of a variant, generating it if necessary"""
+        if self.has_failed(digest, size):
+            raise ValueError(f"Variant {size} of image {digest} could not be rendered")
+        path = self.store.variant_path_for(digest, size)
+        if not os.path.exists(path):
+            await asyncio.wrap_future(self._submit(digest, size, source_mime))
+        return path
+
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(
+                "Profile image variant generation failed: %s", future.exception()
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+image_variants = ImageVariantPool(image_store, settings.IMAGE_WORKERS)
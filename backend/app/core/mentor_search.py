@@ -0,0 +1,114 @@
+import re
+
+from sqlalchemy import Float, Integer, event, or_, text
+from sqlalchemy.orm import Session
+
+from app.core.skills import mentor_skill_labels
+from app.database import Base, User
+
+SEARCH_TABLE = "mentor_search"
+
+# bm25 weights of the name, bio and skills columns
+NAME_WEIGHT = 10.0
+BIO_WEIGHT = 1.0
+SKILLS_WEIGHT = 5.0
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_search_table(conn) -> None:
+    """Create the FTS5 table (rowid = mentor id) and fill it from existing mentors"""
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SEARCH_TABLE},
+    ).first()
+    if exists:
+        return
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+        "name, bio, skills, tokenize = 'unicode61 remove_diacritics 2')"
+    ))
+    conn.execute(text(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, name, bio, skills) "
+        "SELECT users.id, users.name, coalesce(users.bio, ''), "
+        "coalesce((SELECT group_concat(label, ' ') FROM "
+        "(SELECT label FROM mentor_skills WHERE mentor_id = users.id "
+        "ORDER BY position)), '') "
+        "FROM users WHERE users.role = 'mentor'"
+    ))
+
+
+def _create_search_table(target, connection, **kwargs) -> None:
+    if _is_sqlite(connection):
+        create_search_table(connection)
+
+
+def _drop_search_table(target, connection, **kwargs) -> None:
+    if _is_sqlite(connection):
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+# create_all/drop_all manage the search table alongside the regular ones
+event.listen(Base.metadata, "after_create", _create_search_table)
+event.listen(Base.metadata, "before_drop", _drop_search_table)
+
+
+def index_mentor(db: Session, user: User) -> None:
+    """Write a mentor's name, bio and skills to the search table.
+
+    Call before committing profile changes so the index updates in the same
+    transaction. The user must have been flushed (it needs an id).
+    """
+    if user.role != "mentor" or not _is_sqlite(db.get_bind()):
+        return
+    db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": user.id})
+    db.execute(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name, bio, skills) "
+            "VALUES (:id, :name, :bio, :skills)"
+        ),
+        {
+            "id": user.id,
+            "name": user.name,
+            "bio": user.bio or "",
+            "skills": " ".join(mentor_skill_labels(user)),
+        },
+    )
+
+
+def match_query(search: str) -> str:
+    """FTS5 query where every word must match the start of an indexed word"""
+    return " ".join(f'"{word}"*' for word in _WORD_RE.findall(search))
+
+
+def search_matches(db: Session, search: str):
+    """Subquery of (mentor_id, rank) for mentors matching ``search``, or None.
+
+    Lower ranks are better. None means full-text search can't be used (not
+    SQLite, or no searchable words) and callers should fall back to
+    ``search_filter``.
+    """
+    query = match_query(search)
+    if not query or not _is_sqlite(db.get_bind()):
+        return None
+    return (
+        text(
+            f"SELECT rowid AS mentor_id, "
+            f"bm25({SEARCH_TABLE}, {NAME_WEIGHT}, {BIO_WEIGHT}, {SKILLS_WEIGHT}) "
+            "AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query"
+        )
+        .bindparams(query=query)
+        .columns(mentor_id=Integer, rank=Float)
+        .subquery("search_matches")
+    )
+
+
+def search_filter(search: str):
+    """Substring filter on name and bio for databases without FTS5"""
+    pattern = f"%{search}%"
+    return or_(User.name.like(pattern), User.bio.like(pattern))
@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, values: List[Any]) -> str:
+    """Opaque cursor holding the sort key of the last item on a page"""
+    payload = json.dumps({"s": sort, "k": values}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, types: Sequence[type]) -> List[Any]:
+    """Sort key values from a cursor issued for the same sort order.
+
+    ``types`` holds the Python type of each sort column; values of any
+    other type are rejected before they reach the query.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(payload, dict) or payload.get("s") != sort:
+        raise InvalidCursor("Cursor belongs to a different sort order")
+    values = payload.get("k")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor("Malformed cursor")
+    for value, expected in zip(values, types):
+        # bool is an int subclass; a float column may hold a whole number
+        allowed = (int, float) if expected is float else expected
+        if isinstance(value, bool) or not isinstance(value, allowed):
+            raise InvalidCursor("Malformed cursor")
+    return values
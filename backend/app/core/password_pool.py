@@ -0,0 +1,102 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt hashing and verification.
+
+    bcrypt costs 100-300 ms of CPU per call and releases the GIL while it
+    runs, so a small dedicated thread pool keeps the event loop free for
+    other requests. Queue depth and wait times are tracked so the worker
+    count can be sized against the number of cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the executor on first use (and again after shutdown)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash",
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool and await its result"""
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task():
+            started_at = time.perf_counter()
+            wait = started_at - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._total_run += elapsed
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), task)
+
+    def estimated_wait(self) -> float:
+        """Seconds a newly submitted task is expected to wait before it starts"""
+        with self._lock:
+            if not self._completed:
+                return 0.0
+            avg_run = self._total_run / self._completed
+            backlog = self._queued + self._running
+        return max(0, backlog - self.max_workers + 1) * avg_run / self.max_workers
+
+    def stats(self) -> dict:
+        """Snapshot of pool utilisation"""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": completed,
+                "avg_wait_ms": (
+                    round(self._total_wait / completed * 1000, 3) if completed else 0.0
+                ),
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "avg_run_ms": (
+                    round(self._total_run / completed * 1000, 3) if completed else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; the pool is recreated lazily on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS)
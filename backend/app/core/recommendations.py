@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.skill_index import SkillIndex, skill_index
+from app.database import MatchingRequest, User
+
+# Subtracted from a mentor's interest overlap (a fraction between 0 and 1)
+ACCEPTED_PENALTY = 0.5
+PENDING_PENALTY = 0.3
+# Pending requests at which the pending penalty is at its maximum
+LONG_PENDING_QUEUE = 5
+
+# (mentor id, score) pairs, best first
+Ranking = List[Tuple[int, float]]
+
+
+def bitset_array(bits: int, size: int) -> np.ndarray:
+    """Bitset as a 0/1 array of length ``size`` (index = mentor id)"""
+    raw = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:size]
+
+
+def score_mentors(
+    interest_bitsets: Sequence[int],
+    accepted: np.ndarray,
+    pending: np.ndarray,
+    depth: int,
+) -> Ranking:
+    """Best ``depth`` (mentor id, score) pairs among mentors sharing an interest.
+
+    ``accepted`` and ``pending`` count match requests per mentor id.
+    """
+    size = max((bits.bit_length() for bits in interest_bitsets), default=0)
+    if size == 0:
+        return []
+    overlap = np.zeros(size, dtype=np.int32)
+    for bits in interest_bitsets:
+        overlap += bitset_array(bits, size)
+
+    accepted = np.pad(accepted[:size], (0, max(0, size - len(accepted))))
+    pending = np.pad(pending[:size], (0, max(0, size - len(pending))))
+    scores = (
+        overlap / len(interest_bitsets)
+        - ACCEPTED_PENALTY * (accepted > 0)
+        - PENDING_PENALTY * np.minimum(pending / LONG_PENDING_QUEUE, 1.0)
+    )
+
+    candidates = np.flatnonzero(overlap)
+    if len(candidates) > depth:
+        candidates = candidates[np.argpartition(-scores[candidates], depth - 1)[:depth]]
+    # Best first; ties go to the lower mentor id
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [(int(mentor_id), float(scores[mentor_id])) for mentor_id in candidates]
+
+
+class MentorRecommender:
+    """Ranks mentors for a mentee by overlap with the mentee's interests.
+
+    Mentors lose score when they already accepted a match or have a long
+    queue of pending requests. All mentors are scored at once with NumPy
+    over the skill index bitsets, and each mentee's ranking is cached until
+    mentor skills (the skill index generation), match requests or the
+    mentee's interests change. Those signals only see this worker's
+    writes, so rankings and match counts are also recomputed once older
+    than ``max_age`` seconds.
+    """
+
+    def __init__(self, index: SkillIndex, max_entries: int, max_age: float):
+        self.index = index
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, Tuple[tuple, float, Ranking]]" = OrderedDict()
+        self._matches_generation = 0
+        self._match_counts: Optional[Tuple[int, float, np.ndarray, np.ndarray]] = None
+
+    def matches_changed(self) -> None:
+        """Invalidate rankings after a match request is created, updated or deleted"""
+        with self._lock:
+            self._matches_generation += 1
+
+    def _load_match_counts(
+        self, db: Session, generation: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            counts = self._match_counts
+        if counts is not None and counts[0] == generation and self._is_fresh(counts[1]):
+            return counts[2], counts[3]
+
+        rows = db.query(
+            MatchingRequest.mentor_id,
+            func.sum(case((MatchingRequest.status == "accepted", 1), else_=0)),
+            func.sum(case((MatchingRequest.status == "pending", 1), else_=0)),
+        ).group_by(MatchingRequest.mentor_id).all()
+        size = max((mentor_id for mentor_id, _, _ in rows), default=-1) + 1
+        accepted = np.zeros(size, dtype=np.int32)
+        pending = np.zeros(size, dtype=np.int32)
+        for mentor_id, accepted_count, pending_count in rows:
+            accepted[mentor_id] = accepted_count
+            pending[mentor_id] = pending_count
+
+        with self._lock:
+            self._match_counts = (generation, time.monotonic(), accepted, pending)
+        return accepted, pending
+
+    def _is_fresh(self, computed_at: float) -> bool:
+        return time.monotonic() - computed_at <= self.max_age
+
+    def recommend(
+        self, db: Session, mentee_id: int, interest_keys: Sequence[str]
+    ) -> Ranking:
+        """Ranked (mentor id, score) pairs for a mentee, best first"""
+        # Read generations first: a change while scoring leaves a stale key behind
+        with self._lock:
+            key = (
+                self.index.generation,
+                self._matches_generation,
+                tuple(sorted(set(interest_keys))),
+            )
+            cached = self._cache.get(mentee_id)
+            if cached is not None and cached[0] == key and self._is_fresh(cached[1]):
+                self._cache.move_to_end(mentee_id)
+                return cached[2]
+        if not key[2]:
+            return []
+
+        accepted, pending = self._load_match_counts(db, key[1])
+        ranking = score_mentors(
+            self.index.bitsets(db, key[2]),
+            accepted,
+            pending,
+            settings.MENTORS_MAX_PAGE_SIZE,
+        )
+
+        with self._lock:
+            self._cache[mentee_id] = (key, time.monotonic(), ranking)
+            self._cache.move_to_end(mentee_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return ranking
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._match_counts = None
+            self._matches_generation += 1
+
+
+mentor_recommender = MentorRecommender(
+    skill_index,
+    settings.RECOMMENDATION_CACHE_SIZE,
+    settings.RECOMMENDATION_MAX_AGE_SECONDS,
+)
+
+# Keep cached rankings in step with match requests
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(
+        MatchingRequest,
+        _event,
+        lambda *args, **kwargs: mentor_recommender.matches_changed(),
+    )
+# A freshly created or dropped table invalidates everything
+for _table in (User.__table__, MatchingRequest.__table__):
+    for _event in ("after_create", "after_drop"):
+        event.listen(_table, _event, lambda *args, **kwargs: mentor_recommender.reset())
@@ -0,0 +1,94 @@
+from typing import Any, Dict
+
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.content_negotiation import MSGPACK_MEDIA_TYPE, response_format
+from app.core.skills import interest_labels, skill_labels
+from app.database import MatchingRequest, User
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the standard library"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+class NegotiatedResponse(FastJSONResponse):
+    """JSON, or MessagePack when the request's Accept header prefers it.
+
+    Set as the app's default response class, so routes with a response model
+    have their result validated once by FastAPI and then encoded here; both
+    formats carry the same content.
+    """
+
+    def __init__(
+        self,
+        content: Any = None,
+        status_code: int = 200,
+        headers=None,
+        media_type=None,
+        background=None,
+    ):
+        if media_type is None and response_format.get() == "msgpack":
+            media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content)
+        return super().render(content)
+
+
+# The builders below return plain dicts shaped like the response schemas.
+# Building the schema models by hand would validate every object twice:
+# once here and again against the route's response model.
+
+def profile_image_url(user: User) -> str:
+    """Get profile image URL for user"""
+    return f"/images/{user.role}/{user.id}"
+
+
+def user_item(user: User) -> Dict[str, Any]:
+    """A user as MentorListItem"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "role": user.role,
+        "profile": {
+            "name": user.name,
+            "bio": user.bio,
+            "imageUrl": profile_image_url(user),
+            "skills": skill_labels(user),
+        },
+    }
+
+
+def own_profile_item(user: User) -> Dict[str, Any]:
+    """The signed-in user as UserProfile, including their interests"""
+    item = user_item(user)
+    item["profile"]["interests"] = interest_labels(user)
+    return item
+
+
+def matching_request_item(request: MatchingRequest) -> Dict[str, Any]:
+    """A matching request as MatchingRequestResponse"""
+    return {
+        "id": request.id,
+        "menteeId": request.mentee_id,
+        "mentorId": request.mentor_id,
+        "message": request.message,
+        "status": request.status,
+    }
+
+
+def outgoing_request_item(request: MatchingRequest) -> Dict[str, Any]:
+    """A matching request as MatchingRequestOutgoing"""
+    return {
+        "id": request.id,
+        "menteeId": request.mentee_id,
+        "mentorId": request.mentor_id,
+        "status": request.status,
+    }
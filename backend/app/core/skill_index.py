@@ -0,0 +1,135 @@
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.skill_query import Node, evaluate_skill_query
+from app.core.skills import skill_key
+from app.database import MentorSkill, Skill, User
+
+
+def bitset_ids(bits: int) -> List[int]:
+    """Ids of the set bits, in ascending order"""
+    return [
+        mentor_id for mentor_id, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"
+    ]
+
+
+class SkillIndex:
+    """Inverted index of mentor skills (canonical skill key -> mentor ids).
+
+    Each skill maps to a bitset (a Python int with bit ``n`` set for mentor
+    id ``n``), so combining skills with AND/OR is a handful of integer
+    operations. Built from mentor_skills on first use and kept current by
+    calling ``update_mentor`` whenever a mentor's skills are written. The
+    index lives in process memory: each worker builds its own, so it is
+    also reloaded once older than ``max_age`` seconds to pick up writes
+    made elsewhere.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._mentors_by_skill: Dict[str, int] = {}
+        self._skills_by_mentor: Dict[int, FrozenSet[str]] = {}
+        # Bumped on every change, so callers can cache results derived from the index
+        self.generation = 0
+
+    def _is_current(self) -> bool:
+        if not self._loaded:
+            return False
+        return (
+            self.max_age is None or time.monotonic() - self._loaded_at <= self.max_age
+        )
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._is_current():
+            return
+        skills_by_mentor: Dict[int, list] = {}
+        rows = db.query(MentorSkill.mentor_id, Skill.key).join(
+            Skill, Skill.id == MentorSkill.skill_id
+        )
+        for mentor_id, key in rows:
+            skills_by_mentor.setdefault(mentor_id, []).append(key)
+        with self._lock:
+            if self._is_current():
+                return
+            if self._loaded:
+                # A reload may change results, so derived caches must not outlive it
+                self.generation += 1
+                self._mentors_by_skill.clear()
+                self._skills_by_mentor.clear()
+            for mentor_id, keys in skills_by_mentor.items():
+                self._set(mentor_id, keys)
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def _set(self, mentor_id: int, skills: Iterable[str]) -> None:
+        new_skills = frozenset(skills)
+        old_skills = self._skills_by_mentor.get(mentor_id, frozenset())
+        bit = 1 << mentor_id
+        for skill in old_skills - new_skills:
+            bits = self._mentors_by_skill[skill] & ~bit
+            if bits:
+                self._mentors_by_skill[skill] = bits
+            else:
+                del self._mentors_by_skill[skill]
+        for skill in new_skills - old_skills:
+            self._mentors_by_skill[skill] = self._mentors_by_skill.get(skill, 0) | bit
+        if new_skills:
+            self._skills_by_mentor[mentor_id] = new_skills
+        else:
+            self._skills_by_mentor.pop(mentor_id, None)
+
+    def mentors_with(self, db: Session, skill: str) -> FrozenSet[int]:
+        """Ids of mentors that list ``skill`` (or one of its aliases)"""
+        self._ensure_loaded(db)
+        with self._lock:
+            bits = self._mentors_by_skill.get(skill_key(skill), 0)
+        return frozenset(bitset_ids(bits))
+
+    def match_bits(self, db: Session, query: Node) -> int:
+        """Bitset of mentors matching a parsed skill query"""
+        self._ensure_loaded(db)
+        with self._lock:
+            return evaluate_skill_query(
+                query, lambda key: self._mentors_by_skill.get(key, 0)
+            )
+
+    def match(self, db: Session, query: Node) -> List[int]:
+        """Ids of mentors matching a parsed skill query, in ascending order"""
+        return bitset_ids(self.match_bits(db, query))
+
+    def bitsets(self, db: Session, keys: Iterable[str]) -> List[int]:
+        """Bitset of mentor ids for each canonical skill key"""
+        self._ensure_loaded(db)
+        with self._lock:
+            return [self._mentors_by_skill.get(key, 0) for key in keys]
+
+    def update_mentor(self, mentor_id: int, skills: Iterable[str]) -> None:
+        """Record a mentor's new skill keys"""
+        with self._lock:
+            self.generation += 1
+            # Before the first load the database is the source of truth
+            if self._loaded:
+                self._set(mentor_id, skills)
+
+    def reset(self) -> None:
+        """Forget everything; the index is rebuilt on next use"""
+        with self._lock:
+            self.generation += 1
+            self._loaded = False
+            self._mentors_by_skill.clear()
+            self._skills_by_mentor.clear()
+
+
+skill_index = SkillIndex(settings.SKILL_INDEX_MAX_AGE_SECONDS)
+
+# A freshly created or dropped users table invalidates the index
+for _event in ("after_create", "after_drop"):
+    event.listen(User.__table__, _event, lambda *args, **kwargs: skill_index.reset())
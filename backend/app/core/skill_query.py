@@ -0,0 +1,142 @@
+import re
+from typing import Callable, List, Tuple, Union
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.skills import skill_key
+from app.database import MentorSkill, Skill, User
+
+# Longest expression accepted, in skill terms
+MAX_TERMS = 20
+# Deepest nesting of parentheses accepted
+MAX_DEPTH = 2 * MAX_TERMS
+
+_TOKEN_RE = re.compile(r"\s*(\(|\)|&|\||[^()&|\s]+)")
+_OPERATORS = {"and": "&", "or": "|"}
+
+# ("skill", key) | ("and", [nodes]) | ("or", [nodes])
+Node = Tuple[str, Union[str, List["Node"]]]
+
+
+class SkillQueryError(ValueError):
+    pass
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split into operators and skill labels (consecutive words form one label)"""
+    tokens: List[str] = []
+    words: List[str] = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        token = match.group(1)
+        position = match.end()
+        operator = _OPERATORS.get(token.lower(), token)
+        if operator in ("(", ")", "&", "|"):
+            if words:
+                tokens.append(" ".join(words))
+                words = []
+            tokens.append(operator)
+        else:
+            words.append(token)
+    if words:
+        tokens.append(" ".join(words))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser; AND binds tighter than OR"""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+        self.terms = 0
+        self.depth = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek() is not None:
+            raise SkillQueryError(f"Unexpected '{self._peek()}'")
+        return node
+
+    def _or(self) -> Node:
+        nodes = [self._and()]
+        while self._peek() == "|":
+            self._next()
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def _and(self) -> Node:
+        nodes = [self._term()]
+        while self._peek() == "&":
+            self._next()
+            nodes.append(self._term())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def _term(self) -> Node:
+        token = self._next()
+        if token == "(":
+            self.depth += 1
+            if self.depth > MAX_DEPTH:
+                raise SkillQueryError(f"At most {MAX_DEPTH} nested parentheses")
+            node = self._or()
+            if self._next() != ")":
+                raise SkillQueryError("Missing ')'")
+            self.depth -= 1
+            return node
+        if token is None or token in (")", "&", "|"):
+            raise SkillQueryError("Expected a skill")
+        self.terms += 1
+        if self.terms > MAX_TERMS:
+            raise SkillQueryError(f"At most {MAX_TERMS} skills per query")
+        return ("skill", skill_key(token))
+
+
+def parse_skill_query(text: str) -> Node:
+    """Parse e.g. ``react AND (typescript OR js)``; ``&`` and ``|`` also work"""
+    return _Parser(_tokenize(text)).parse()
+
+
+def evaluate_skill_query(node: Node, bits_for: Callable[[str], int]) -> int:
+    """Evaluate a parsed query to a bitset of mentor ids"""
+    kind, value = node
+    if kind == "skill":
+        return bits_for(value)
+    results = (evaluate_skill_query(child, bits_for) for child in value)
+    bits = next(results)
+    for child_bits in results:
+        if kind == "and":
+            bits &= child_bits
+            if not bits:
+                break
+        else:
+            bits |= child_bits
+    return bits
+
+
+def skill_query_condition(node: Node) -> ColumnElement:
+    """SQL condition on ``User`` equivalent to a parsed query.
+
+    One EXISTS per skill term, so the statement's size depends on the
+    expression, not on how many mentors match it.
+    """
+    kind, value = node
+    if kind == "skill":
+        return (
+            select(MentorSkill.mentor_id)
+            .join(Skill, Skill.id == MentorSkill.skill_id)
+            .where(MentorSkill.mentor_id == User.id, Skill.key == value)
+            .exists()
+        )
+    combine = and_ if kind == "and" else or_
+    return combine(*(skill_query_condition(child) for child in value))
@@ -0,0 +1,109 @@
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.skills import skill_key
+from app.database import Skill
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded like PostgreSQL's pg_trgm"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[start:start + 3] for start in range(len(padded) - 2))
+    return grams
+
+
+class SkillTrigramIndex:
+    """Trigram index over the skill vocabulary for typo-tolerant lookups.
+
+    Maps each trigram to the skill keys containing it, so resolving a
+    misspelled skill counts shared trigrams in one pass over the query's
+    postings and picks the most similar key (Jaccard similarity of the
+    trigram sets). New skills are added as they are loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._postings: Dict[str, List[str]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._names: Dict[str, str] = {}
+
+    def _add(self, key: str, name: str) -> None:
+        if key in self._names:
+            return
+        grams = trigrams(key)
+        self._names[key] = name
+        self._sizes[key] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(key)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        skills = db.query(Skill.key, Skill.name).all()
+        with self._lock:
+            if self._loaded:
+                return
+            for key, name in skills:
+                self._add(key, name)
+            self._loaded = True
+
+    def add(self, key: str, name: str) -> None:
+        """Record a newly created skill"""
+        with self._lock:
+            # Before the first load the database is the source of truth
+            if self._loaded:
+                self._add(key, name)
+
+    def resolve(self, db: Session, text: str) -> Optional[Tuple[str, str]]:
+        """(key, name) of the skill ``text`` most likely means, or None"""
+        self._ensure_loaded(db)
+        key = skill_key(text)
+        grams = trigrams(key)
+        with self._lock:
+            if key in self._names:
+                return key, self._names[key]
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+            candidates = [
+                (-count / (len(grams) + self._sizes[candidate] - count), candidate)
+                for candidate, count in shared.items()
+            ]
+            # Most similar first; ties go to the alphabetically first key
+            best = min(candidates, default=None)
+            if best is None or -best[0] < settings.SKILL_FUZZY_MIN_SIMILARITY:
+                return None
+            return best[1], self._names[best[1]]
+
+    def reset(self) -> None:
+        """Forget everything; the index is rebuilt on next use"""
+        with self._lock:
+            self._loaded = False
+            self._postings = {}
+            self._sizes = {}
+            self._names = {}
+
+
+skill_trigrams = SkillTrigramIndex()
+
+# Skills are never removed, so new skills are the only change to follow.
+# get_or_create_skills inserts them with a Core statement (no mapper insert
+# event) and loads them right after; ``add`` ignores keys it already has.
+event.listen(
+    Skill, "load", lambda target, context: skill_trigrams.add(target.key, target.name)
+)
+# A freshly created or dropped skills table invalidates the index
+event.listen(
+    Skill.__table__, "after_create", lambda *args, **kwargs: skill_trigrams.reset()
+)
+event.listen(
+    Skill.__table__, "after_drop", lambda *args, **kwargs: skill_trigrams.reset()
+)
@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import MenteeInterest, MentorSkill, Skill, User
+
+# Common spellings mapped to one canonical skill key
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "nextjs": "next.js",
+    "py": "python",
+    "python3": "python",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "csharp": "c#",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+}
+
+
+def skill_key(label: str) -> str:
+    """Canonical key of a skill: whitespace-collapsed, case-folded, de-aliased"""
+    key = " ".join(label.split()).casefold()
+    return SKILL_ALIASES.get(key, key)
+
+
+def get_or_create_skills(db: Session, labels: Iterable[str]) -> Dict[str, Skill]:
+    """Map each label's key to its Skill row, creating missing ones"""
+    wanted = {}
+    for label in labels:
+        wanted.setdefault(skill_key(label), label.strip())
+    if not wanted:
+        return {}
+
+    skills = {
+        skill.key: skill for skill in db.query(Skill).filter(Skill.key.in_(wanted))
+    }
+    missing = {key: label for key, label in wanted.items() if key not in skills}
+    if missing:
+        skills.update(_insert_missing_skills(db, missing))
+    return skills
+
+
+def _insert_missing_skills(db: Session, missing: Dict[str, str]) -> Dict[str, Skill]:
+    """Insert skills by key, then read them back.
+
+    Another request may create the same skill between our select and this
+    insert; ON CONFLICT DO NOTHING keeps its row instead of failing on the
+    unique key, and the select returns whichever row won.
+    """
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    db.execute(
+        insert(Skill)
+        .values([{"key": key, "name": label} for key, label in missing.items()])
+        .on_conflict_do_nothing(index_elements=[Skill.key])
+    )
+    return {
+        skill.key: skill for skill in db.query(Skill).filter(Skill.key.in_(missing))
+    }
+
+
+def _skill_rows(
+    db: Session, existing_rows, row_type, labels: Iterable[str]
+) -> Tuple[list, List[str]]:
+    """Rows of ``row_type`` for ``labels`` in order, and their skill keys.
+
+    Rows already in ``existing_rows`` are reused.
+    """
+    labels = [label for label in labels if label and label.strip()]
+    skills = get_or_create_skills(db, labels)
+
+    # Keep rows for skills the user already had; the primary key is (user, skill)
+    existing = {row.skill_id: row for row in existing_rows}
+    rows = []
+    keys = []
+    for label in labels:
+        key = skill_key(label)
+        if key in keys:
+            continue
+        skill = skills[key]
+        row = existing.get(skill.id) if skill.id is not None else None
+        if row is None:
+            row = row_type(skill=skill)
+        row.position = len(rows)
+        row.label = label.strip()
+        rows.append(row)
+        keys.append(key)
+    return rows, keys
+
+
+def set_mentor_skills(db: Session, user: User, labels: Iterable[str]) -> List[str]:
+    """Replace a mentor's skills, keeping their order and spelling; returns the keys"""
+    user.skills, keys = _skill_rows(db, user.skills, MentorSkill, labels)
+    return keys
+
+
+def set_mentee_interests(db: Session, user: User, labels: Iterable[str]) -> List[str]:
+    """Replace the skills a mentee wants to learn; returns the keys"""
+    user.interests, keys = _skill_rows(db, user.interests, MenteeInterest, labels)
+    return keys
+
+
+def mentor_skill_labels(user: User) -> List[str]:
+    """A mentor's skills in their own order and spelling"""
+    return [row.label for row in user.skills]
+
+
+def skill_labels(user: User) -> Optional[List[str]]:
+    """Skills for API responses (None for mentees and mentors without skills)"""
+    if user.role != "mentor":
+        return None
+    return mentor_skill_labels(user) or None
+
+
+def interest_labels(user: User) -> Optional[List[str]]:
+    """Interests for API responses (None for mentors, who have no interests)"""
+    if user.role != "mentee":
+        return None
+    return [row.label for row in user.interests]
@@ -0,0 +1,178 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.skills import skill_key
+from app.database import MentorSkill, Skill, User
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _name_keys(name: str) -> List[str]:
+    """The name from each word on, so "hop" completes "Grace Hopper" """
+    words = _normalize(name).split(" ")
+    return [" ".join(words[start:]) for start in range(len(words)) if words[start]]
+
+
+class SuggestionIndex:
+    """Prefix completions for mentor names and skills.
+
+    Both are kept in sorted lists, so a prefix lookup is a bisect followed
+    by a short scan. Names are indexed from every word on; skills carry
+    the number of mentors listing them and the most common ones are
+    suggested first. Built from the database on first use and updated by
+    ``update_mentor`` on profile writes. The index lives in process memory:
+    each worker builds its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._names: List[Tuple[str, int]] = []  # (name key, mentor id), sorted
+        self._name_by_mentor: Dict[int, str] = {}
+        self._skill_keys: List[str] = []  # sorted
+        self._skills: Dict[str, List] = {}  # key -> [display name, mentor count]
+        self._skills_by_mentor: Dict[int, List[str]] = {}
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        names = db.query(User.id, User.name).filter(User.role == "mentor").all()
+        skills: Dict[int, List[Tuple[str, str]]] = {}
+        rows = db.query(MentorSkill.mentor_id, Skill.key, Skill.name).join(
+            Skill, Skill.id == MentorSkill.skill_id
+        )
+        for mentor_id, key, name in rows:
+            skills.setdefault(mentor_id, []).append((key, name))
+        with self._lock:
+            if self._loaded:
+                return
+            # Build in bulk and sort once rather than inserting entry by entry
+            self._name_by_mentor = {
+                mentor_id: name for mentor_id, name in names if name
+            }
+            self._names = sorted(
+                (key, mentor_id)
+                for mentor_id, name in self._name_by_mentor.items()
+                for key in _name_keys(name)
+            )
+            # (mentor, skill) pairs are unique in mentor_skills
+            for mentor_id, mentor_skills in skills.items():
+                self._skills_by_mentor[mentor_id] = [key for key, _ in mentor_skills]
+                for key, name in mentor_skills:
+                    self._skills.setdefault(key, [name, 0])[1] += 1
+            self._skill_keys = sorted(self._skills)
+            self._loaded = True
+
+    def _set_name(self, mentor_id: int, name: str) -> None:
+        old_name = self._name_by_mentor.pop(mentor_id, None)
+        if old_name is not None:
+            for key in _name_keys(old_name):
+                entry = (key, mentor_id)
+                position = bisect_left(self._names, entry)
+                if position < len(self._names) and self._names[position] == entry:
+                    del self._names[position]
+        if name:
+            self._name_by_mentor[mentor_id] = name
+            for key in _name_keys(name):
+                insort(self._names, (key, mentor_id))
+
+    def _set_skills(self, mentor_id: int, skills: Iterable[Tuple[str, str]]) -> None:
+        for key in self._skills_by_mentor.pop(mentor_id, ()):
+            entry = self._skills[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._skills[key]
+                del self._skill_keys[bisect_left(self._skill_keys, key)]
+        keys = []
+        for key, label in skills:
+            if key in keys:
+                continue
+            keys.append(key)
+            if key in self._skills:
+                self._skills[key][1] += 1
+            else:
+                self._skills[key] = [label, 1]
+                insort(self._skill_keys, key)
+        if keys:
+            self._skills_by_mentor[mentor_id] = keys
+
+    def update_mentor(
+        self, mentor_id: int, name: str, skills: Optional[Iterable[str]] = None
+    ) -> None:
+        """Record a mentor's name and, if given, their skill labels"""
+        with self._lock:
+            # Before the first load the database is the source of truth
+            if not self._loaded:
+                return
+            self._set_name(mentor_id, name)
+            if skills is not None:
+                self._set_skills(
+                    mentor_id, [(skill_key(label), label) for label in skills]
+                )
+
+    def suggest(
+        self, db: Session, prefix: str, limit: int
+    ) -> Tuple[List[str], List[Tuple[int, str]]]:
+        """Skills and mentors starting with ``prefix``.
+
+        Up to ``limit`` of each: skills most common first, mentors by name.
+        """
+        self._ensure_loaded(db)
+        prefix = _normalize(prefix)
+        skill_prefix = skill_key(prefix)
+        with self._lock:
+            # Skill keys resolve aliases, so "golang" also completes "go"
+            skill_keys = set()
+            for candidate in {prefix, skill_prefix}:
+                position = bisect_left(self._skill_keys, candidate)
+                while position < len(self._skill_keys):
+                    key = self._skill_keys[position]
+                    if not key.startswith(candidate):
+                        break
+                    skill_keys.add(key)
+                    position += 1
+            top_skills = heapq.nsmallest(
+                limit, skill_keys, key=lambda key: (-self._skills[key][1], key)
+            )
+            skills = [self._skills[key][0] for key in top_skills]
+
+            mentors: List[Tuple[int, str]] = []
+            seen = set()
+            position = bisect_left(self._names, (prefix,))
+            while position < len(self._names) and len(mentors) < limit:
+                key, mentor_id = self._names[position]
+                if not key.startswith(prefix):
+                    break
+                if mentor_id not in seen:
+                    seen.add(mentor_id)
+                    mentors.append((mentor_id, self._name_by_mentor[mentor_id]))
+                position += 1
+        return skills, mentors
+
+    def reset(self) -> None:
+        """Forget everything; the index is rebuilt on next use"""
+        with self._lock:
+            self._loaded = False
+            self._names = []
+            self._name_by_mentor = {}
+            self._skill_keys = []
+            self._skills = {}
+            self._skills_by_mentor = {}
+
+
+suggestion_index = SuggestionIndex()
+
+# A freshly created or dropped users table invalidates the index
+event.listen(
+    User.__table__, "after_create", lambda *args, **kwargs: suggestion_index.reset()
+)
+event.listen(
+    User.__table__, "after_drop", lambda *args, **kwargs: suggestion_index.reset()
+)
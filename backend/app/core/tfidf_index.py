@@ -0,0 +1,223 @@
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.skills import SKILL_ALIASES
+from app.database import MentorSkill, User
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words, with skill aliases resolved (js -> javascript)"""
+    words = (word.casefold() for word in _WORD_RE.findall(text))
+    return [SKILL_ALIASES.get(word, word) for word in words]
+
+
+class _Matrix(NamedTuple):
+    """TF-IDF weights, column-major: rows[col_ptr[t]:col_ptr[t + 1]] hold term t"""
+    mentor_ids: np.ndarray
+    idf: np.ndarray
+    col_ptr: np.ndarray
+    rows: np.ndarray
+    weights: np.ndarray
+
+
+_EMPTY_MATRIX = _Matrix(
+    mentor_ids=np.empty(0, dtype=np.int64),
+    idf=np.empty(0),
+    col_ptr=np.zeros(1, dtype=np.int64),
+    rows=np.empty(0, dtype=np.int64),
+    weights=np.empty(0),
+)
+
+
+def build_matrix(
+    documents: List[Tuple[int, np.ndarray, np.ndarray]], vocabulary_size: int
+) -> _Matrix:
+    """Weight and normalize (mentor id, term ids, sublinear tf) documents"""
+    if not documents:
+        return _EMPTY_MATRIX
+    mentor_ids = np.fromiter(
+        (mentor_id for mentor_id, _, _ in documents),
+        dtype=np.int64,
+        count=len(documents),
+    )
+    lengths = np.fromiter(
+        (len(terms) for _, terms, _ in documents), dtype=np.int64, count=len(documents)
+    )
+    cols = np.concatenate([terms for _, terms, _ in documents])
+    tf = np.concatenate([tf for _, _, tf in documents])
+    rows = np.repeat(np.arange(len(documents)), lengths)
+
+    # Smoothed idf, as in scikit-learn, then L2-normalized rows
+    df = np.bincount(cols, minlength=vocabulary_size)
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    weights = tf * idf[cols]
+    squares = np.bincount(rows, weights=weights * weights, minlength=len(documents))
+    weights /= np.sqrt(squares)[rows]
+
+    order = np.argsort(cols, kind="stable")
+    return _Matrix(
+        mentor_ids=mentor_ids,
+        idf=idf,
+        col_ptr=np.concatenate(([0], np.cumsum(df))),
+        rows=rows[order],
+        weights=weights[order],
+    )
+
+
+class TfidfIndex:
+    """TF-IDF vectors of mentor bios and skills for free-text ranking.
+
+    A profile change only re-tokenizes that mentor. The weighted matrix is
+    reassembled with a few vectorized NumPy operations on the next search,
+    at most once every ``TFIDF_REBUILD_SECONDS`` (searches in between use
+    the previous matrix). Columns are stored per term, so a query only reads
+    the entries of its own terms; cosine similarity is their weighted sum.
+    The index lives in process memory: each worker builds its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._vocabulary: Dict[str, int] = {}
+        self._documents: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._matrix = _EMPTY_MATRIX
+        self._dirty = False
+        self._building = False
+        self._built_at = float("-inf")
+
+    def _document(
+        self, bio: Optional[str], skills: Iterable[str]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Term ids and sublinear term frequencies (lock held)"""
+        counts = Counter(tokenize(" ".join([bio or "", *skills])))
+        if not counts:
+            return None
+        vocabulary = self._vocabulary
+        terms = np.fromiter(
+            (vocabulary.setdefault(term, len(vocabulary)) for term in counts),
+            dtype=np.int64, count=len(counts),
+        )
+        frequencies = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        tf = 1 + np.log(frequencies)
+        return terms, tf
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        skills: Dict[int, List[str]] = {}
+        rows = db.query(MentorSkill.mentor_id, MentorSkill.label).order_by(
+            MentorSkill.mentor_id, MentorSkill.position
+        )
+        for mentor_id, label in rows:
+            skills.setdefault(mentor_id, []).append(label)
+        mentors = db.query(User.id, User.bio).filter(User.role == "mentor").all()
+        with self._lock:
+            if self._loaded:
+                return
+            for mentor_id, bio in mentors:
+                document = self._document(bio, skills.get(mentor_id, ()))
+                if document is not None:
+                    self._documents[mentor_id] = document
+            self._loaded = True
+            self._dirty = True
+            self._built_at = float("-inf")
+
+    def update_mentor(
+        self, mentor_id: int, bio: Optional[str], skills: Iterable[str]
+    ) -> None:
+        """Record a mentor's new bio and skills"""
+        with self._lock:
+            # Before the first load the database is the source of truth
+            if not self._loaded:
+                return
+            document = self._document(bio, skills)
+            if document is None:
+                self._documents.pop(mentor_id, None)
+            else:
+                self._documents[mentor_id] = document
+            self._dirty = True
+
+    def _current_matrix(self) -> _Matrix:
+        """The matrix, rebuilt first if it is stale and due"""
+        with self._lock:
+            due = time.monotonic() - self._built_at >= settings.TFIDF_REBUILD_SECONDS
+            if not self._dirty or self._building or not due:
+                return self._matrix
+            self._building = True
+            self._dirty = False
+            documents = [
+                (mentor_id, terms, tf)
+                for mentor_id, (terms, tf) in self._documents.items()
+            ]
+            vocabulary_size = len(self._vocabulary)
+
+        # Build without the lock so other searches keep using the old matrix
+        try:
+            matrix = build_matrix(documents, vocabulary_size)
+        except BaseException:
+            with self._lock:
+                self._building = False
+                self._dirty = True
+            raise
+        with self._lock:
+            self._matrix = matrix
+            self._building = False
+            self._built_at = time.monotonic()
+        return matrix
+
+    def search(self, db: Session, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top ``k`` (mentor id, cosine similarity) pairs for a free-text query"""
+        self._ensure_loaded(db)
+        matrix = self._current_matrix()
+        with self._lock:
+            terms = Counter(
+                self._vocabulary[term] for term in tokenize(query)
+                if self._vocabulary.get(term, len(matrix.idf)) < len(matrix.idf)
+            )
+        if not terms:
+            return []
+
+        cols = np.fromiter(terms, dtype=np.int64, count=len(terms))
+        frequencies = np.fromiter(terms.values(), dtype=np.float64)
+        query_weights = (1 + np.log(frequencies)) * matrix.idf[cols]
+        query_weights /= np.linalg.norm(query_weights)
+
+        scores = np.zeros(len(matrix.mentor_ids))
+        for col, query_weight in zip(cols, query_weights):
+            start, end = matrix.col_ptr[col], matrix.col_ptr[col + 1]
+            scores[matrix.rows[start:end]] += query_weight * matrix.weights[start:end]
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # Best first; ties go to the lower mentor id
+        order = np.lexsort((matrix.mentor_ids[candidates], -scores[candidates]))
+        candidates = candidates[order]
+        return [(int(matrix.mentor_ids[row]), float(scores[row])) for row in candidates]
+
+    def reset(self) -> None:
+        """Forget everything; the index is rebuilt on next use"""
+        with self._lock:
+            self._loaded = False
+            self._vocabulary = {}
+            self._documents = {}
+            self._matrix = _EMPTY_MATRIX
+            self._dirty = False
+            self._built_at = float("-inf")
+
+
+mentor_tfidf = TfidfIndex()
+
+# A freshly created or dropped users table invalidates the index
+for _event in ("after_create", "after_drop"):
+    event.listen(User.__table__, _event, lambda *args, **kwargs: mentor_tfidf.reset())
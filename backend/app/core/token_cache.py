@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of JWT payloads whose signature and claims already checked out.
+
+    Entries are keyed by a SHA-256 digest of the raw token (the token itself
+    is never kept) and are dropped once the token's own ``exp`` has passed,
+    so a cached entry is never trusted for longer than the token is valid.
+    """
+
+    def __init__(self, max_size: int, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return a copy of the cached payload, or None on a miss"""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(payload)
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, token: str, payload: dict) -> None:
+        """Remember a verified payload until its ``exp`` claim"""
+        if not self.enabled or self.max_size <= 0:
+            return
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = VerifiedTokenCache(
+    settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_ENABLED
+)
+
+
+class TokenVersionCache:
+    """Recently seen ``users.token_version`` values.
+
+    Lets claims-only authentication reject revoked tokens without a query
+    per request; a revocation is noticed after at most ``max_age`` seconds
+    on other workers, immediately on the worker that made it.
+    """
+
+    def __init__(self, max_age: float, max_size: int):
+        self.max_age = max_age
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[int]:
+        """Return the cached version, or None if unknown or too old"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            fetched_at, version = entry
+            if time.monotonic() - fetched_at > self.max_age:
+                del self._entries[user_id]
+                return None
+            return version
+
+    def put(self, user_id: int, version: int) -> None:
+        if self.max_age <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_versions = TokenVersionCache(
+    settings.PRINCIPAL_MAX_STALENESS_SECONDS, settings.TOKEN_CACHE_SIZE
+)
@@ -1,6 +1,19 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, LargeBinary, Text
+from sqlalchemy import (
+    create_engine,
+    inspect,
+    text,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    LargeBinary,
+    Text,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import deferred, relationship, sessionmaker
 from datetime import datetime
 import os
 
@@ -24,11 +37,71 @@ class User(Base):
     name = Column(String, nullable=False)
     role = Column(String, nullable=False)  # "mentor" or "mentee"
     bio = Column(Text, nullable=True)
-    tech_stack = Column(String, nullable=True)  # JSON string for mentors
-    profile_image = Column(LargeBinary, nullable=True)
+    # Legacy JSON skills; moved to mentor_skills by app.migrations
+    tech_stack = Column(String, nullable=True)
+    # Legacy in-row image bytes; new images live in the image store (see app.migrations)
+    profile_image = deferred(Column(LargeBinary, nullable=True))
     profile_image_filename = Column(String, nullable=True)
+    # SHA-256 of the stored image file
+    profile_image_hash = Column(String, nullable=True)
+    profile_image_mime = Column(String, nullable=True)
+    # Bump to revoke issued tokens
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    skills = relationship(
+        "MentorSkill", order_by="MentorSkill.position", cascade="all, delete-orphan"
+    )
+    interests = relationship(
+        "MenteeInterest",
+        order_by="MenteeInterest.position",
+        cascade="all, delete-orphan",
+    )
+    
+    __table_args__ = (
+        # Mentor list pages are read in (name, id) order per role
+        Index("ix_users_role_name_id", "role", "name", "id"),
+    )
+
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # Canonical form, see app.core.skills
+    key = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String, nullable=False)  # Display name as first entered
+
+class MentorSkill(Base):
+    __tablename__ = "mentor_skills"
+    
+    mentor_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    # Order the mentor listed the skill in
+    position = Column(Integer, nullable=False, default=0)
+    label = Column(String, nullable=False)  # Skill as the mentor wrote it
+    
+    skill = relationship(Skill)
+    
+    __table_args__ = (
+        # Skill filters look up mentors by skill
+        Index("ix_mentor_skills_skill_id_mentor_id", "skill_id", "mentor_id"),
+    )
+
+class MenteeInterest(Base):
+    __tablename__ = "mentee_interests"
+    
+    mentee_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    # Order the mentee listed the interest in
+    position = Column(Integer, nullable=False, default=0)
+    label = Column(String, nullable=False)  # Interest as the mentee wrote it
+    
+    skill = relationship(Skill)
 
 class MatchingRequest(Base):
     __tablename__ = "matching_requests"
@@ -49,6 +122,30 @@ def get_db():
     finally:
         db.close()
 
+def add_missing_columns(bind=engine):
+    """Add columns and indexes introduced after a table was first created"""
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+            existing_indexes = {
+                index["name"] for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
@@ -1,33 +1,74 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
+from contextlib import asynccontextmanager
+from typing import Optional
 import os
+import secrets
 
 from app.core.config import settings
-from app.api.routes import auth, users, mentors, matching
+from app.api.routes import auth, users, mentors, matching, export
+from app.core.admission import hash_admission
+from app.core.body_limit import RequestBodyLimitMiddleware
+from app.core.compression import CompressionMiddleware, compression_stats
+from app.core.content_negotiation import MessagePackMiddleware
+from app.core.image_variants import image_variants
+from app.core.password_pool import password_pool
+from app.core.serializers import NegotiatedResponse
+from app.core.token_cache import token_cache
 from app.database import init_db
 
 # Initialize database on startup
 init_db()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release worker pools on shutdown"""
+    yield
+    password_pool.shutdown()
+    image_variants.shutdown()
+
 app = FastAPI(
     title="Mentor-Mentee Matching API",
     description="API for matching mentors and mentees in a mentoring platform",
     version="1.0.0",
     openapi_url="/openapi.json",
     docs_url="/swagger-ui",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # Encode responses with orjson (or MessagePack when asked for); routes
+    # return plain data validated once
+    default_response_class=NegotiatedResponse
+)
+
+# Accept and return MessagePack; added first so the body limit applies before decoding
+app.add_middleware(MessagePackMiddleware)
+
+# Reject oversized request bodies before they are parsed
+app.add_middleware(
+    RequestBodyLimitMiddleware, max_body_size=settings.MAX_REQUEST_BODY_BYTES
 )
 
-# Configure CORS
+# Compress large text responses; images are already compressed
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Configure CORS (added last so it wraps every other middleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Resolved-Skill", "X-Missing-Ids"],
 )
 
 # Exception handler to convert 422 validation errors to 400 bad request
@@ -41,16 +82,25 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 # Create uploads directory if it doesn't exist
-os.makedirs("uploads", exist_ok=True)
+os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+# Everything under UPLOAD_DIR is public, so profile images must live elsewhere
+_upload_dir = os.path.realpath(settings.UPLOAD_DIR)
+_image_store_dir = os.path.realpath(settings.IMAGE_STORE_DIR)
+if os.path.commonpath([_upload_dir, _image_store_dir]) == _upload_dir:
+    raise RuntimeError(
+        "IMAGE_STORE_DIR must not be inside UPLOAD_DIR, which is served at /uploads"
+    )
 
 # Mount static files for profile images
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 # Include API routes
 app.include_router(auth.router, prefix="/api", tags=["Authentication"])
 app.include_router(users.router, prefix="/api", tags=["User Profile"])
 app.include_router(mentors.router, prefix="/api", tags=["Mentors"])
 app.include_router(matching.router, prefix="/api", tags=["Matching"])
+app.include_router(export.router, prefix="/api", tags=["Export"])
 
 @app.get("/", include_in_schema=False)
 async def root():
@@ -61,3 +111,30 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+def require_metrics_key(x_api_key: Optional[str] = Header(None)):
+    """Allow /metrics only with the configured X-API-Key"""
+    if settings.METRICS_API_KEY is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Metrics are disabled"
+        )
+    if x_api_key is None or not secrets.compare_digest(
+        x_api_key, settings.METRICS_API_KEY
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics API key"
+        )
+
+@app.get(
+    "/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_key)]
+)
+async def metrics():
+    """Runtime statistics for capacity tuning"""
+    return {
+        "password_hashing": password_pool.stats(),
+        "auth_admission": hash_admission.stats(),
+        "token_cache": token_cache.stats(),
+        "compression": compression_stats.stats()
+    }
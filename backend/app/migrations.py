@@ -0,0 +1,113 @@
+"""
+One-shot data migrations.
+
+    python -m app.migrations profile-images
+    python -m app.migrations mentor-skills
+    python -m app.migrations image-store-dir
+"""
+import argparse
+import json
+import os
+from typing import Optional
+
+from sqlalchemy.orm import Session, undefer
+
+from app.core.config import settings
+from app.core.image_store import image_store, store_profile_image
+from app.core.mentor_search import index_mentor
+from app.core.skills import set_mentor_skills
+from app.database import SessionLocal, User, init_db
+
+def migrate_profile_images(db: Session, batch_size: int = 100) -> int:
+    """Move profile image blobs out of the users table into the image store"""
+    rows = db.query(User.id).filter(User.profile_image.isnot(None)).order_by(User.id)
+    user_ids = [user_id for (user_id,) in rows]
+
+    # Load blobs a batch at a time so memory stays bounded
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        users = (
+            db.query(User)
+            .options(undefer(User.profile_image))
+            .filter(User.id.in_(batch))
+            .all()
+        )
+        for user in users:
+            store_profile_image(user, user.profile_image, user.profile_image_filename)
+        db.commit()
+        db.expunge_all()
+
+    return len(user_ids)
+
+def migrate_mentor_skills(db: Session, batch_size: int = 100) -> int:
+    """Move the legacy JSON tech_stack column into mentor_skills.
+
+    Values that can't be migrated (mentees, invalid JSON, not a list) are
+    left in tech_stack, so no data is lost. Returns how many were migrated.
+    """
+    rows = db.query(User.id).filter(User.tech_stack.isnot(None)).order_by(User.id)
+    user_ids = [user_id for (user_id,) in rows]
+
+    migrated = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        for user in db.query(User).filter(User.id.in_(batch)).all():
+            try:
+                labels = json.loads(user.tech_stack)
+            except json.JSONDecodeError:
+                continue
+            if user.role != "mentor" or not isinstance(labels, list):
+                continue
+            set_mentor_skills(
+                db, user, [label for label in labels if isinstance(label, str)]
+            )
+            db.flush()
+            index_mentor(db, user)
+            user.tech_stack = None
+            migrated += 1
+        db.commit()
+        db.expunge_all()
+
+    return migrated
+
+def migrate_image_store_dir(db: Session, legacy_root: Optional[str] = None) -> int:
+    """Move stored images from the public UPLOAD_DIR/images into IMAGE_STORE_DIR"""
+    legacy_root = legacy_root or os.path.join(settings.UPLOAD_DIR, "images")
+    moved = 0
+    for directory, _, filenames in os.walk(legacy_root, topdown=False):
+        for filename in filenames:
+            source = os.path.join(directory, filename)
+            target = os.path.join(
+                image_store.root, os.path.relpath(source, legacy_root)
+            )
+            if filename.startswith(".tmp-") or os.path.exists(target):
+                # Leftover temp files and duplicates of stored content
+                os.unlink(source)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(source, target)
+            moved += 1
+        os.rmdir(directory)
+    return moved
+
+MIGRATIONS = {
+    "profile-images": migrate_profile_images,
+    "mentor-skills": migrate_mentor_skills,
+    "image-store-dir": migrate_image_store_dir,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a one-shot data migration")
+    parser.add_argument("migration", choices=sorted(MIGRATIONS))
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        migrated = MIGRATIONS[args.migration](db)
+    finally:
+        db.close()
+    print(f"{args.migration}: migrated {migrated} rows")
+
+if __name__ == "__main__":
+    main()
@@ -23,11 +23,15 @@ class UserProfileData(BaseModel):
     imageUrl: Optional[str] = None  # Changed from profile_image_url to match API spec
     skills: Optional[List[str]] = None  # Changed from tech_stack to skills to match API spec
 
+class OwnProfileData(UserProfileData):
+    """Profile data of the signed-in user, who also sees their interests"""
+    interests: Optional[List[str]] = None  # Skills a mentee wants to learn
+
 class UserProfile(BaseModel):
     id: int
     email: str
     role: str
-    profile: UserProfileData  # Make this required to match API spec
+    profile: OwnProfileData  # Make this required to match API spec
     
     class Config:
         from_attributes = True
@@ -37,6 +41,7 @@ class UserProfileUpdate(BaseModel):
     bio: Optional[str] = None
     image: Optional[str] = None  # Base64 encoded image string per API spec
     skills: Optional[List[str]] = None  # Changed from tech_stack to skills
+    interests: Optional[List[str]] = None  # Mentees only
     role: Optional[str] = None
 
 class UpdateMentorProfileRequest(BaseModel):
@@ -66,6 +71,20 @@ class MentorListItem(BaseModel):
     class Config:
         from_attributes = True
 
+class SkillFacet(BaseModel):
+    """Number of mentors listing a skill"""
+    skill: str
+    count: int
+
+class MentorSuggestion(BaseModel):
+    id: int
+    name: str
+
+class MentorSuggestions(BaseModel):
+    """Autocomplete results for the mentor search box"""
+    skills: List[str]
+    mentors: List[MentorSuggestion]
+
 # Matching schemas
 class MatchingRequestCreate(BaseModel):
     mentorId: int  # Changed from mentor_id to mentorId per API spec
@@ -103,7 +122,7 @@ class ErrorResponse(BaseModel):
 # Export all schemas
 __all__ = [
     "SignupRequest", "LoginRequest", "LoginResponse",
-    "UserProfile", "UserProfileData", "UserProfileUpdate", 
+    "UserProfile", "UserProfileData", "OwnProfileData", "UserProfileUpdate", 
     "UpdateMentorProfileRequest", "UpdateMenteeProfileRequest",
     "MentorListItem", 
     "MatchingRequestCreate", "MatchingRequestResponse", "MatchingRequestOutgoing", "MatchingRequestUpdate",
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/mentors against a freshly seeded SQLite database.
+
+Reports mean/p50/p95 latency and the peak Python memory allocated per
+request, so changes to the mentor list path can be compared run to run.
+
+    python benchmarks/bench_mentors.py --mentors 200 --image-kb 512
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mentors", type=int, default=200, help="Number of mentors to seed")
+    parser.add_argument("--image-kb", type=int, default=512, help="Profile image size per mentor (KB)")
+    parser.add_argument("--requests", type=int, default=50, help="Number of timed requests")
+    args = parser.parse_args()
+
+    # Point the app at a throwaway database before it is imported
+    workdir = tempfile.mkdtemp(prefix="bench-mentors-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.chdir(workdir)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import SessionLocal, User
+    from app.core.auth import get_password_hash, create_access_token
+
+    password_hash = get_password_hash("benchmark")
+    image = os.urandom(args.image_kb * 1024)
+    skills = ["Python", "React", "Go", "Rust", "TypeScript", "Django", "AWS"]
+
+    db = SessionLocal()
+    for i in range(args.mentors):
+        mentor = User(
+            email=f"mentor{i}@example.com",
+            hashed_password=password_hash,
+            name=f"Mentor {i:05d}",
+            role="mentor",
+            bio=f"Mentor number {i} with experience in {skills[i % len(skills)]}",
+            profile_image=image,
+            profile_image_filename="profile.jpg",
+        )
+        db.add(mentor)
+        db.flush()
+    db.add(User(email="mentee@example.com", hashed_password=password_hash, name="Mentee", role="mentee"))
+    db.commit()
+    mentee = db.query(User).filter(User.email == "mentee@example.com").first()
+    token = create_access_token({"sub": str(mentee.id), "email": mentee.email, "name": mentee.name, "role": "mentee"})
+    db.close()
+
+    client = TestClient(app)
+    client.headers.update({"Authorization": f"Bearer {token}"})
+
+    # Warm up connection pools and caches
+    for _ in range(3):
+        client.get("/api/mentors")
+
+    latencies = []
+    peaks = []
+    for _ in range(args.requests):
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = client.get("/api/mentors")
+        latencies.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert response.status_code == 200, response.text
+
+    latencies.sort()
+    print(f"mentors={args.mentors} image_kb={args.image_kb} requests={args.requests}")
+    print(f"latency mean={statistics.mean(latencies) * 1000:.2f}ms "
+          f"p50={latencies[len(latencies) // 2] * 1000:.2f}ms "
+          f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f}ms")
+    print(f"peak memory per request mean={statistics.mean(peaks) / 1024:.1f}KB max={max(peaks) / 1024:.1f}KB")
+    print(f"response bytes={len(response.content)}")
+
+if __name__ == "__main__":
+    main()
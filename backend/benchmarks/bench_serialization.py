@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark turning a GET /api/mentors page into JSON bytes.
+
+Times the response stage only (no database): building the items,
+validating them against the route's response model and encoding them.
+"models" is the previous path, where routes built MentorListItem objects
+by hand and FastAPI encoded them with Pydantic; "dicts" is the current
+one, where routes return plain dicts that are validated once and encoded
+with orjson. The last two lines compare encoding a fields= response.
+
+    python benchmarks/bench_serialization.py --mentors 1000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mentors", type=int, default=1000, help="Mentors per response")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per variant")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from typing import List
+
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from app.core.serializers import FastJSONResponse, user_item
+    from app.database import MentorSkill, User
+    from app.schemas import MentorListItem
+
+    skills = ["Python", "React", "Go", "Rust", "TypeScript", "Django", "AWS"]
+    mentors = [
+        User(
+            id=i,
+            email=f"mentor{i}@example.com",
+            name=f"Mentor {i:05d}",
+            role="mentor",
+            bio=f"Mentor number {i} with experience in {skills[i % len(skills)]}",
+            skills=[MentorSkill(position=n, label=label) for n, label in enumerate(skills[i % 3:i % 3 + 3])],
+        )
+        for i in range(args.mentors)
+    ]
+    # What FastAPI does with the route's response_model=List[MentorListItem]
+    adapter = TypeAdapter(List[MentorListItem])
+
+    def models():
+        items = [MentorListItem(**user_item(mentor)) for mentor in mentors]
+        return adapter.dump_json(adapter.validate_python(items))
+
+    def dicts():
+        items = adapter.validate_python([user_item(mentor) for mentor in mentors])
+        return FastJSONResponse(adapter.dump_python(items, mode="json")).body
+
+    sparse = [{"id": mentor.id, "profile": {"name": mentor.name}} for mentor in mentors]
+    assert models() == dicts()
+    assert JSONResponse(sparse).body == FastJSONResponse(sparse).body
+
+    print(f"mentors={args.mentors} repeat={args.repeat}")
+    for name, run in [
+        ("models", models),
+        ("dicts", dicts),
+        ("fields= json", lambda: JSONResponse(sparse).body),
+        ("fields= orjson", lambda: FastJSONResponse(sparse).body),
+    ]:
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        print(f"{name:<15} best={best * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    main()
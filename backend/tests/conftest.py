@@ -8,6 +8,7 @@ import os
 from app.main import app
 from app.database import get_db, Base
 from app.core.auth import get_current_user
+from app.core.admission import hash_admission
 
 # Create temporary database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -23,6 +24,12 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
+@pytest.fixture(autouse=True)
+def reset_admission_control():
+    # Rate-limit state must not leak between tests that reuse the same emails
+    hash_admission.reset()
+    yield
+
 @pytest.fixture(scope="function")
 def client():
     # Create tables
@@ -101,3 +108,10 @@ def sample_image():
     # Create a small test image (1x1 PNG)
     png_data = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00IEND\xaeB`\x82'
     return png_data
+
+@pytest.fixture
+def metrics_key(monkeypatch):
+    # /metrics is disabled unless METRICS_API_KEY is set
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "METRICS_API_KEY", "metrics-secret")
+    return {"X-API-Key": "metrics-secret"}
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from fastapi import HTTPException, status
+
+from app.core.admission import HashAdmissionController, TokenBucketRegistry, hash_admission
+
+
+class StubPool:
+    """Password pool stand-in with a fixed queue wait estimate"""
+
+    def __init__(self, wait: float = 0.0):
+        self.wait = wait
+
+    def estimated_wait(self) -> float:
+        return self.wait
+
+
+def make_controller(pool=None, **overrides):
+    options = dict(
+        enabled=True,
+        max_concurrent=10,
+        latency_budget_ms=1000,
+        ip_rate=1.0,
+        ip_burst=100,
+        email_rate=1.0,
+        email_burst=100,
+        max_tracked_keys=100,
+    )
+    options.update(overrides)
+    return HashAdmissionController(pool=pool or StubPool(), **options)
+
+
+async def admit_once(controller, email="user@example.com", client_ip="10.0.0.1"):
+    async with controller.admit(email=email, client_ip=client_ip):
+        pass
+
+
+class TestAdmissionControl:
+    """Test admission control for password hashing"""
+
+    def test_token_bucket_exhaustion_reports_retry_after(self):
+        """Test a bucket refuses once its burst is spent"""
+        buckets = TokenBucketRegistry(rate=0.5, burst=2, max_keys=10)
+        assert buckets.take("a") == 0
+        assert buckets.take("a") == 0
+        assert buckets.take("a") > 0
+        # Other keys are independent
+        assert buckets.take("b") == 0
+
+    def test_token_bucket_evicts_oldest_keys(self):
+        """Test tracked keys are bounded"""
+        buckets = TokenBucketRegistry(rate=1.0, burst=1, max_keys=2)
+        for key in ("a", "b", "c"):
+            buckets.take(key)
+        assert len(buckets._buckets) == 2
+
+    def test_per_email_limit_returns_429(self):
+        """Test repeated attempts on one email are shed with 429"""
+        controller = make_controller(email_burst=2, email_rate=0.01)
+        asyncio.run(admit_once(controller, client_ip="10.0.0.1"))
+        asyncio.run(admit_once(controller, client_ip="10.0.0.2"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(admit_once(controller, client_ip="10.0.0.3"))
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        assert controller.stats()["rejected"]["email"] == 1
+
+    def test_per_ip_limit_returns_429(self):
+        """Test credential stuffing from one IP across many emails is shed"""
+        controller = make_controller(ip_burst=3, ip_rate=0.01)
+        for i in range(3):
+            asyncio.run(admit_once(controller, email=f"user{i}@example.com"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(admit_once(controller, email="other@example.com"))
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert controller.stats()["rejected"]["client_ip"] == 1
+
+    def test_latency_budget_exceeded_returns_429(self):
+        """Test requests are shed when the hash queue is over budget"""
+        controller = make_controller(pool=StubPool(wait=3.5), latency_budget_ms=1000)
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(admit_once(controller))
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert exc_info.value.headers["Retry-After"] == "3"
+
+    def test_concurrency_cap_returns_503(self):
+        """Test the global concurrency cap sheds with 503"""
+        controller = make_controller(max_concurrent=1)
+
+        async def scenario():
+            async with controller.admit(email="a@example.com", client_ip="10.0.0.1"):
+                await admit_once(controller, email="b@example.com", client_ip="10.0.0.2")
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(scenario())
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "Retry-After" in exc_info.value.headers
+        assert controller.stats()["in_flight"] == 0
+
+    def test_disabled_controller_admits_everything(self):
+        """Test admission control can be switched off"""
+        controller = make_controller(enabled=False, email_burst=0)
+        asyncio.run(admit_once(controller))
+        assert controller.stats()["admitted"] == 0
+
+    def test_login_storm_is_shed_by_endpoint(self, client, test_user_mentee, monkeypatch):
+        """Test /api/login answers 429 with Retry-After once the email bucket is empty"""
+        client.post("/api/signup", json=test_user_mentee)
+        monkeypatch.setattr(hash_admission, "email_buckets", TokenBucketRegistry(0.01, 1, 100))
+
+        credentials = {"email": test_user_mentee["email"], "password": "wrongpassword"}
+        first = client.post("/api/login", json=credentials)
+        assert first.status_code == status.HTTP_401_UNAUTHORIZED
+
+        second = client.post("/api/login", json=credentials)
+        assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in second.headers
@@ -1,4 +1,5 @@
 import pytest
+import time
 from datetime import datetime, timedelta
 from app.core.auth import (
     verify_password, 
@@ -177,3 +178,99 @@ class TestAuthUtils:
             assert authenticated_user is None
         finally:
             db.close()
+
+
+class TestVerifiedTokenCache:
+    """Test the verified-JWT cache"""
+
+    def test_repeat_verification_hits_cache(self):
+        """Test a token verified once is served from the cache"""
+        from app.core.token_cache import token_cache
+
+        token = create_access_token({"sub": "321", "role": "mentee"})
+        before = token_cache.stats()
+
+        first = verify_token(token)
+        second = verify_token(token)
+
+        after = token_cache.stats()
+        assert first == second
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+
+    def test_cached_payload_is_a_copy(self):
+        """Test callers cannot corrupt cached payloads"""
+        token = create_access_token({"sub": "654"})
+        payload = verify_token(token)
+        payload["sub"] = "tampered"
+        assert verify_token(token)["sub"] == "654"
+
+    def test_entries_expire_with_token(self):
+        """Test entries are dropped once the token's exp has passed"""
+        from app.core.token_cache import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_size=10)
+        cache.put("expired-token", {"sub": "1", "exp": time.time() - 10})
+        assert cache.get("expired-token") is None
+        assert cache.stats()["size"] == 0
+
+    def test_cache_is_bounded(self):
+        """Test least recently used entries are evicted"""
+        from app.core.token_cache import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_size=2)
+        exp = time.time() + 60
+        for token in ("a", "b", "c"):
+            cache.put(token, {"sub": token, "exp": exp})
+        assert cache.get("a") is None
+        assert cache.get("c")["sub"] == "c"
+        assert cache.stats()["size"] == 2
+
+    def test_disabled_cache_never_hits(self):
+        """Test the cache can be switched off"""
+        from app.core.token_cache import VerifiedTokenCache
+
+        cache = VerifiedTokenCache(max_size=10, enabled=False)
+        cache.put("token", {"sub": "1", "exp": time.time() + 60})
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestClaimsPrincipal:
+    """Test claims-only authentication for read endpoints"""
+
+    def test_principal_built_from_claims(self, authenticated_mentee_client):
+        """Test read endpoints authorize from token claims"""
+        response = authenticated_mentee_client.get("/api/mentors")
+        assert response.status_code == 200
+
+    def test_revoked_token_rejected(self, authenticated_mentee_client):
+        """Test bumping the token version revokes previously issued tokens"""
+        from tests.conftest import override_get_db
+        from app.core.auth import revoke_user_tokens
+
+        assert authenticated_mentee_client.get("/api/mentors").status_code == 200
+
+        db = next(override_get_db())
+        try:
+            user = db.query(User).filter(User.email == "mentee@example.com").first()
+            revoke_user_tokens(db, user)
+        finally:
+            db.close()
+
+        response = authenticated_mentee_client.get("/api/mentors")
+        assert response.status_code == 401
+        assert authenticated_mentee_client.get("/api/me").status_code == 401
+
+    def test_token_without_role_claim_falls_back_to_users_row(self, client, test_user_mentee):
+        """Test tokens lacking role claims still authorize via the users table"""
+        client.post("/api/signup", json=test_user_mentee)
+        login = client.post("/api/login", json={
+            "email": test_user_mentee["email"],
+            "password": test_user_mentee["password"]
+        })
+        user_id = verify_token(login.json()["token"])["sub"]
+
+        token = create_access_token({"sub": user_id})
+        response = client.get("/api/mentors", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, CompressionStats, choose_encoding
+
+LARGE = {"mentors": ["Mentor %d" % n for n in range(500)]}
+
+
+def make_client(stats):
+    async def large(request):
+        return JSONResponse(LARGE)
+
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    async def image(request):
+        return Response(b"\xff\xd8" + bytes(4096), media_type="image/jpeg")
+
+    async def stream(request):
+        async def lines():
+            for n in range(3):
+                yield b'{"n": %d}\n' % n
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app = Starlette(routes=[Route(f"/{view.__name__}", view) for view in (large, small, image, stream)])
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=500, content_types=["application/json", "application/x-ndjson"],
+        gzip_level=6, brotli_quality=4, stats=stats,
+    )
+    return TestClient(app)
+
+
+class TestCompression:
+    """Test the response compression middleware"""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+    ])
+    def test_choose_encoding(self, header, expected):
+        """Test Accept-Encoding negotiation honours q-values"""
+        assert choose_encoding(header) == expected
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br"])
+    def test_compresses_large_json(self, encoding):
+        """Test large JSON bodies are compressed with the accepted encoding"""
+        stats = CompressionStats()
+        response = make_client(stats).get("/large", headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        # The client decodes the body; Content-Length is the compressed size
+        assert response.json() == LARGE
+        assert int(response.headers["content-length"]) < len(response.content)
+        totals = stats.stats()["encodings"][encoding]
+        assert totals["responses"] == 1
+        assert totals["bytes_out"] < totals["bytes_in"]
+
+    def test_skips_small_and_image_responses(self):
+        """Test bodies under the minimum size and non-text types are left alone"""
+        stats = CompressionStats()
+        client = make_client(stats)
+        assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+        assert stats.stats()["skipped_small"] == 1
+
+    def test_compresses_streams(self):
+        """Test streamed NDJSON is compressed chunk by chunk"""
+        response = make_client(CompressionStats()).get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text.splitlines() == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+
+    def test_metrics_report_compression(self, client, metrics_key):
+        """Test /metrics includes the compression statistics"""
+        response = client.get("/metrics", headers={**metrics_key, "Accept-Encoding": "gzip"})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()["compression"]["encodings"]) == {"br", "gzip"}
@@ -0,0 +1,63 @@
+import msgpack
+import pytest
+from fastapi import status
+
+from app.core.content_negotiation import prefers_msgpack
+
+MSGPACK = "application/msgpack"
+
+
+class TestMessagePack:
+    """Test MessagePack requests and responses"""
+
+    @pytest.mark.parametrize("accept, expected", [
+        ("application/msgpack", True),
+        ("application/x-msgpack, application/json;q=0.5", True),
+        ("application/json, application/msgpack;q=0.5", False),
+        ("application/json", False),
+        ("*/*", False),
+        ("", False),
+    ])
+    def test_prefers_msgpack(self, accept, expected):
+        """Test Accept negotiation between JSON and MessagePack"""
+        assert prefers_msgpack(accept) is expected
+
+    def test_responses_match_json(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test MessagePack responses carry the same content as JSON ones"""
+        mentor_id = authenticated_mentor_client.get("/api/me").json()["id"]
+        authenticated_mentee_client.post("/api/match-requests", json={"mentorId": mentor_id, "message": "Hi"})
+
+        for path in ["/api/mentors", f"/api/mentors/{mentor_id}", "/api/match-requests", "/api/mentors?fields=id,name"]:
+            response = authenticated_mentee_client.get(path, headers={"Accept": MSGPACK})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"] == MSGPACK
+            assert msgpack.unpackb(response.content) == authenticated_mentee_client.get(path).json()
+
+    def test_responses_vary_on_accept(self, authenticated_mentee_client):
+        """Test caches are told the body depends on the Accept header"""
+        for accept in [MSGPACK, "application/json"]:
+            for path in ["/api/me", "/api/mentors"]:
+                response = authenticated_mentee_client.get(path, headers={"Accept": accept, "Origin": "http://localhost:3000"})
+                vary = [value.strip() for value in response.headers["vary"].split(",")]
+                assert "Accept" in vary
+                assert "Origin" in vary
+
+    def test_msgpack_request_body(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test a MessagePack body is parsed like the equivalent JSON"""
+        mentor_id = authenticated_mentor_client.get("/api/me").json()["id"]
+        response = authenticated_mentee_client.post(
+            "/api/match-requests",
+            content=msgpack.packb({"mentorId": mentor_id, "message": "Hi"}),
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        created = msgpack.unpackb(response.content)
+        assert created["mentorId"] == mentor_id
+        assert created["status"] == "pending"
+
+    def test_invalid_msgpack_body(self, authenticated_mentee_client):
+        """Test undecodable MessagePack is rejected with 400"""
+        response = authenticated_mentee_client.post(
+            "/api/match-requests", content=b"\xc1", headers={"Content-Type": MSGPACK}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
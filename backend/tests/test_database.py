@@ -190,3 +190,53 @@ class TestDatabaseModels:
         assert user.profile_image_filename == "test.png"
         
         db.close()
+
+    def test_add_missing_columns_upgrades_existing_table(self, tmp_path):
+        """Test columns added to the models are added to older databases"""
+        from sqlalchemy import create_engine, inspect, text
+        from app.database import add_missing_columns
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, "
+                "hashed_password VARCHAR NOT NULL, name VARCHAR NOT NULL, role VARCHAR NOT NULL)"
+            ))
+            conn.execute(text(
+                "INSERT INTO users (email, hashed_password, name, role) VALUES ('a@example.com', 'x', 'A', 'mentee')"
+            ))
+
+        add_missing_columns(bind=engine)
+
+        columns = {column["name"] for column in inspect(engine).get_columns("users")}
+        assert "token_version" in columns
+        indexes = {index["name"] for index in inspect(engine).get_indexes("users")}
+        assert "ix_users_role_name_id" in indexes
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT token_version FROM users")).scalar() == 0
+        engine.dispose()
+
+    def test_profile_image_not_loaded_by_default(self, client):
+        """Test user queries leave the image bytes unloaded until accessed"""
+        from sqlalchemy import inspect as sa_inspect
+        from tests.conftest import override_get_db
+
+        db = next(override_get_db())
+        try:
+            db.add(User(
+                email="image@example.com",
+                hashed_password="hashed",
+                name="Image User",
+                role="mentor",
+                profile_image=b"\x89PNG" + b"\x00" * 1024
+            ))
+            db.commit()
+            db.expunge_all()
+
+            user = db.query(User).filter(User.email == "image@example.com").first()
+            assert "profile_image" in sa_inspect(user).unloaded
+            assert user.name == "Image User"
+
+            assert len(user.profile_image) == 1028
+        finally:
+            db.close()
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.core.skills import set_mentor_skills
+from app.database import MatchingRequest, User
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def export_key(monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_API_KEY", "export-secret")
+    return {"X-API-Key": "export-secret"}
+
+
+def seed_mentors(count):
+    """Add mentors (each with one skill) and a mentee straight to the database"""
+    db = TestingSessionLocal()
+    try:
+        mentee = User(email="mentee@example.com", hashed_password="x", name="Mentee", role="mentee")
+        db.add(mentee)
+        mentors = []
+        for n in range(count):
+            mentor = User(email=f"mentor{n}@example.com", hashed_password="x", name=f"Mentor {n}", role="mentor")
+            set_mentor_skills(db, mentor, ["Go" if n % 2 else "Rust"])
+            db.add(mentor)
+            mentors.append(mentor)
+        db.flush()
+        db.add(MatchingRequest(mentee_id=mentee.id, mentor_id=mentors[0].id, message="Hi", status="pending"))
+        db.commit()
+        return [mentor.id for mentor in mentors]
+    finally:
+        db.close()
+
+
+class TestExport:
+    """Test the NDJSON export endpoints"""
+
+    def test_exports_every_mentor_across_batches(self, client, export_key, monkeypatch):
+        """Test mentors stream one per line, in id order, over several batches"""
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+        mentor_ids = seed_mentors(5)
+
+        response = client.get("/api/export/mentors", headers=export_key)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == mentor_ids
+        assert lines[0]["profile"]["skills"] == ["Rust"]
+        assert lines[1]["profile"]["skills"] == ["Go"]
+
+    def test_exports_matching_requests(self, client, export_key):
+        """Test matching requests stream as NDJSON"""
+        mentor_ids = seed_mentors(1)
+
+        response = client.get("/api/export/match-requests", headers=export_key)
+        assert response.status_code == status.HTTP_200_OK
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["mentorId"] == mentor_ids[0]
+        assert lines[0]["message"] == "Hi"
+
+    def test_requires_api_key(self, client, export_key):
+        """Test a missing or wrong key is rejected"""
+        assert client.get("/api/export/mentors").status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.get("/api/export/match-requests", headers={"X-API-Key": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_disabled_without_configured_key(self, client, monkeypatch):
+        """Test exports are off unless EXPORT_API_KEY is set"""
+        monkeypatch.setattr(settings, "EXPORT_API_KEY", None)
+        response = client.get("/api/export/mentors", headers={"X-API-Key": "anything"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,412 @@
+import base64
+import hashlib
+import io
+import os
+import pytest
+from fastapi import status
+
+from app.core.image_store import image_store, sniff_image_type
+from app.database import User
+from app.migrations import migrate_image_store_dir, migrate_profile_images
+
+
+@pytest.fixture(autouse=True)
+def isolated_image_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_store, "root", str(tmp_path / "images"))
+    yield image_store
+
+
+def current_user_id(client):
+    return client.get("/api/me").json()["id"]
+
+
+class TestImageStore:
+    """Test the content-addressed profile image store"""
+
+    def test_sniff_image_type(self, sample_image):
+        """Test mime types are detected from magic bytes"""
+        assert sniff_image_type(sample_image) == "image/png"
+        assert sniff_image_type(b"\xff\xd8\xff\xe0rest") == "image/jpeg"
+        assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+        assert sniff_image_type(b"not an image") is None
+
+    def test_save_is_content_addressed(self, sample_image):
+        """Test identical bytes are stored once under their hash"""
+        digest = image_store.save(sample_image)
+        assert digest == hashlib.sha256(sample_image).hexdigest()
+        assert image_store.save(sample_image) == digest
+
+        path = image_store.path_for(digest)
+        with open(path, "rb") as stored:
+            assert stored.read() == sample_image
+        assert os.listdir(os.path.dirname(path)) == [digest]
+
+    def test_upload_then_serve_from_store(self, authenticated_mentee_client, sample_image):
+        """Test uploaded images are served from disk with their sniffed type"""
+        files = {"file": ("avatar.png", io.BytesIO(sample_image), "image/png")}
+        response = authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        assert response.status_code == status.HTTP_200_OK
+
+        user_id = current_user_id(authenticated_mentee_client)
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == sample_image
+
+        from tests.conftest import override_get_db
+        db = next(override_get_db())
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            assert user.profile_image is None
+            assert user.profile_image_hash == hashlib.sha256(sample_image).hexdigest()
+            assert user.profile_image_mime == "image/png"
+        finally:
+            db.close()
+
+    def test_base64_profile_image_uses_store(self, authenticated_mentor_client, sample_image):
+        """Test PUT /api/profile writes images to the store"""
+        response = authenticated_mentor_client.put("/api/profile", json={
+            "image": base64.b64encode(sample_image).decode()
+        })
+        assert response.status_code == status.HTTP_200_OK
+
+        digest = hashlib.sha256(sample_image).hexdigest()
+        assert image_store.exists(digest)
+
+    def test_store_not_served_publicly(self):
+        """Test the image store is outside the directory served at /uploads"""
+        from app.core.config import settings
+        from app.main import app
+
+        upload_dir = os.path.realpath(settings.UPLOAD_DIR)
+        store_dir = os.path.realpath(settings.IMAGE_STORE_DIR)
+        assert os.path.commonpath([upload_dir, store_dir]) != upload_dir
+        served = [route.app.directory for route in app.routes if getattr(route, "path", None) == "/uploads"]
+        assert [os.path.realpath(directory) for directory in served] == [upload_dir]
+
+    def test_migration_moves_store_out_of_uploads(self, tmp_path, sample_image):
+        """Test images under the old public directory move into the store"""
+        digest = hashlib.sha256(sample_image).hexdigest()
+        legacy_root = tmp_path / "uploads" / "images"
+        (legacy_root / digest[:2]).mkdir(parents=True)
+        (legacy_root / digest[:2] / digest).write_bytes(sample_image)
+
+        assert migrate_image_store_dir(None, str(legacy_root)) == 1
+        assert image_store.exists(digest)
+        assert not legacy_root.exists()
+
+    def test_missing_image_returns_404(self, authenticated_mentee_client):
+        """Test users without an image get 404"""
+        user_id = current_user_id(authenticated_mentee_client)
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_migration_moves_blobs_out_of_users_table(self, authenticated_mentee_client, sample_image):
+        """Test the one-shot migration empties the blob column"""
+        from tests.conftest import override_get_db
+
+        user_id = current_user_id(authenticated_mentee_client)
+        db = next(override_get_db())
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            user.profile_image = sample_image
+            user.profile_image_filename = "legacy.png"
+            db.commit()
+
+            # Not yet migrated images are still served from the row
+            response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == sample_image
+
+            assert migrate_profile_images(db) == 1
+            assert migrate_profile_images(db) == 0
+
+            user = db.query(User).filter(User.id == user_id).first()
+            assert user.profile_image is None
+            assert image_store.exists(user.profile_image_hash)
+            assert user.profile_image_mime == "image/png"
+        finally:
+            db.close()
+
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == sample_image
+
+
+class TestImageHttpCaching:
+    """Test conditional requests for profile images"""
+
+    @pytest.fixture
+    def uploaded(self, authenticated_mentee_client, sample_image):
+        files = {"file": ("avatar.png", io.BytesIO(sample_image), "image/png")}
+        authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        user_id = current_user_id(authenticated_mentee_client)
+        return authenticated_mentee_client, f"/api/images/mentee/{user_id}"
+
+    def test_validators_present(self, uploaded, sample_image):
+        """Test responses carry a content-hash ETag, Last-Modified and Cache-Control"""
+        client, url = uploaded
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] == f'"{hashlib.sha256(sample_image).hexdigest()}"'
+        assert "last-modified" in response.headers
+        assert response.headers["cache-control"].startswith("private, max-age=")
+
+    def test_if_none_match_returns_304(self, uploaded):
+        """Test a matching ETag revalidates without a body"""
+        client, url = uploaded
+        etag = client.get(url).headers["etag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_stale_etag_returns_full_image(self, uploaded, sample_image):
+        """Test a non-matching ETag gets the full image"""
+        client, url = uploaded
+        response = client.get(url, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == sample_image
+
+    def test_if_modified_since(self, uploaded):
+        """Test If-Modified-Since revalidation"""
+        client, url = uploaded
+        last_modified = client.get(url).headers["last-modified"]
+
+        response = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_etag_takes_precedence_over_date(self, uploaded):
+        """Test If-Modified-Since is ignored when If-None-Match is present"""
+        client, url = uploaded
+        last_modified = client.get(url).headers["last-modified"]
+        response = client.get(url, headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+        assert response.status_code == status.HTTP_200_OK
+
+
+def make_png(width, height):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestImageVariants:
+    """Test resized profile image variants"""
+
+    def test_variant_resized_on_request(self, authenticated_mentee_client):
+        """Test ?size= returns an image that fits the requested box"""
+        from PIL import Image
+
+        original = make_png(400, 300)
+        files = {"file": ("avatar.png", io.BytesIO(original), "image/png")}
+        authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        user_id = current_user_id(authenticated_mentee_client)
+
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}?size=64")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "image/png"
+        with Image.open(io.BytesIO(response.content)) as thumbnail:
+            assert thumbnail.size == (64, 48)
+
+        digest = hashlib.sha256(original).hexdigest()
+        assert response.headers["etag"] == f'"{digest}-64"'
+        assert image_store.variant_exists(digest, 64)
+
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}?size=original")
+        assert response.content == original
+
+    def test_variant_generated_lazily_for_existing_images(self, authenticated_mentor_client):
+        """Test images stored before variants existed get them on first request"""
+        from tests.conftest import override_get_db
+        from app.core.image_store import store_profile_image
+
+        original = make_png(600, 600)
+        user_id = current_user_id(authenticated_mentor_client)
+        db = next(override_get_db())
+        try:
+            user = db.query(User).filter(User.id == user_id).first()
+            store_profile_image(user, original, "old.png")
+            db.commit()
+        finally:
+            db.close()
+
+        digest = hashlib.sha256(original).hexdigest()
+        assert not image_store.variant_exists(digest, 256)
+
+        response = authenticated_mentor_client.get(f"/api/images/mentor/{user_id}?size=256")
+        assert response.status_code == status.HTTP_200_OK
+        assert image_store.variant_exists(digest, 256)
+        assert len(response.content) < len(original)
+
+    def test_variant_conditional_request(self, authenticated_mentee_client):
+        """Test variants revalidate with their own ETag"""
+        files = {"file": ("avatar.png", io.BytesIO(make_png(300, 300)), "image/png")}
+        authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        url = f"/api/images/mentee/{current_user_id(authenticated_mentee_client)}?size=256"
+
+        etag = authenticated_mentee_client.get(url).headers["etag"]
+        response = authenticated_mentee_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_undecodable_image_falls_back_to_original(self, authenticated_mentee_client, sample_image):
+        """Test images Pillow cannot decode are served as uploaded"""
+        files = {"file": ("avatar.png", io.BytesIO(sample_image), "image/png")}
+        authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        user_id = current_user_id(authenticated_mentee_client)
+
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}?size=64")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == sample_image
+
+    def test_undecodable_image_revalidates_without_rerendering(self, authenticated_mentee_client, sample_image, monkeypatch):
+        """Test a failed variant keeps the original's ETag and is not rendered again"""
+        from app.core.image_variants import image_variants
+
+        files = {"file": ("avatar.png", io.BytesIO(sample_image), "image/png")}
+        authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        url = f"/api/images/mentee/{current_user_id(authenticated_mentee_client)}?size=64"
+        etag = authenticated_mentee_client.get(url).headers["etag"]
+        assert etag == f'"{hashlib.sha256(sample_image).hexdigest()}"'
+
+        submissions = []
+        monkeypatch.setattr(image_variants, "_get_executor", lambda: submissions.append(1))
+        assert authenticated_mentee_client.get(url).status_code == status.HTTP_200_OK
+        response = authenticated_mentee_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert submissions == []
+
+    def test_concurrent_requests_share_one_render(self, monkeypatch):
+        """Test a variant already being rendered is not submitted again"""
+        from concurrent.futures import Future
+        from app.core.image_variants import ImageVariantPool
+
+        submitted = []
+
+        class FakeExecutor:
+            def submit(self, *args):
+                submitted.append(args)
+                return Future()
+
+        pool = ImageVariantPool(image_store, max_workers=1)
+        monkeypatch.setattr(pool, "_get_executor", lambda: FakeExecutor())
+        first = pool._submit("abc", 64, "image/png")
+        assert pool._submit("abc", 64, "image/png") is first
+        assert len(submitted) == 1
+
+        first.set_exception(OSError("cannot identify image file"))
+        assert pool.has_failed("abc", 64)
+        assert pool._submit("abc", 256, "image/png") is not first
+
+    def test_render_refuses_oversized_bitmaps(self, tmp_path, monkeypatch):
+        """Test workers check dimensions before decoding images stored earlier"""
+        from app.core.config import settings
+        from app.core.image_variants import render_variant
+
+        source = tmp_path / "source"
+        source.write_bytes(make_png(400, 300))
+        monkeypatch.setattr(settings, "MAX_PROFILE_IMAGE_PIXELS", 100 * 100)
+        with pytest.raises(ValueError):
+            render_variant(str(source), str(tmp_path / "variant"), 64, "image/png")
+        assert not (tmp_path / "variant").exists()
+
+    def test_invalid_size_rejected(self, authenticated_mentee_client):
+        """Test unknown sizes return 400"""
+        user_id = current_user_id(authenticated_mentee_client)
+        response = authenticated_mentee_client.get(f"/api/images/mentee/{user_id}?size=999")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestStreamingUploads:
+    """Test size limits are enforced while uploads stream in"""
+
+    def leftover_files(self):
+        return [
+            name for _, _, names in os.walk(image_store.root) for name in names if name.startswith(".tmp-")
+        ]
+
+    def test_oversized_multipart_upload_rejected(self, authenticated_mentee_client, sample_image):
+        """Test uploads over 1MB are rejected and leave nothing behind"""
+        payload = sample_image + b"\x00" * (1024 * 1024)
+        files = {"file": ("big.png", io.BytesIO(payload), "image/png")}
+        response = authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert self.leftover_files() == []
+
+    def test_oversized_base64_image_rejected(self, authenticated_mentee_client):
+        """Test base64 images over 1MB are refused before decoding"""
+        encoded = base64.b64encode(b"\x00" * (1024 * 1024 + 1)).decode()
+        response = authenticated_mentee_client.put("/api/profile", json={"image": encoded})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["error"] == "Image size must be less than 1MB"
+        assert self.leftover_files() == []
+
+    def test_oversized_dimensions_rejected(self, authenticated_mentee_client, monkeypatch):
+        """Test images whose bitmap would exceed the pixel limit are refused at upload"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "MAX_PROFILE_IMAGE_PIXELS", 100 * 100)
+        files = {"file": ("wide.png", io.BytesIO(make_png(400, 300)), "image/png")}
+        response = authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Image dimensions are too large"
+
+        encoded = base64.b64encode(make_png(400, 300)).decode()
+        response = authenticated_mentee_client.put("/api/profile", json={"image": encoded})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["error"] == "Image dimensions are too large"
+        assert self.leftover_files() == []
+
+        files = {"file": ("small.png", io.BytesIO(make_png(100, 100)), "image/png")}
+        response = authenticated_mentee_client.post("/api/me/profile-image", files=files)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_invalid_base64_image_rejected(self, authenticated_mentee_client):
+        """Test malformed base64 is rejected"""
+        response = authenticated_mentee_client.put("/api/profile", json={"image": "not*base64!"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["error"] == "Invalid base64 image data"
+
+    def test_line_wrapped_base64_decoded_in_chunks(self, monkeypatch):
+        """Test chunked decoding matches a one-shot decode"""
+        import app.core.image_store as image_store_module
+        monkeypatch.setattr(image_store_module, "BASE64_CHUNK_SIZE", 8)
+
+        data = os.urandom(1000)
+        encoded = base64.encodebytes(data).decode()  # wrapped every 76 characters
+        with image_store.writer(max_bytes=2000) as writer:
+            writer.write_base64(encoded)
+            digest = writer.commit()
+        assert digest == hashlib.sha256(data).hexdigest()
+
+    def test_request_body_limit_by_content_length(self, authenticated_mentee_client):
+        """Test bodies over the global limit get 413 before parsing"""
+        from app.core.config import settings
+
+        body = b"{" + b" " * settings.MAX_REQUEST_BODY_BYTES + b"}"
+        response = authenticated_mentee_client.put(
+            "/api/profile", content=body, headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def test_request_body_limit_for_chunked_bodies(self, authenticated_mentee_client):
+        """Test streamed bodies without Content-Length are cut off at the limit"""
+        from app.core.config import settings
+
+        def chunks():
+            chunk = b" " * (256 * 1024)
+            for _ in range(settings.MAX_REQUEST_BODY_BYTES // len(chunk) + 2):
+                yield chunk
+
+        response = authenticated_mentee_client.put(
+            "/api/profile", content=chunks(), headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
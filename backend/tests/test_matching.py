@@ -206,3 +206,29 @@ class TestMatchingRequests:
                 request_id = create_response.json()["id"]
                 cancel_response = authenticated_mentee_client.delete(f"/api/matching-requests/{request_id}")
                 assert cancel_response.status_code in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND]
+
+
+class TestMatchingRequestFieldsets:
+    """Test fields= on the matching request lists"""
+
+    def test_lists_return_only_requested_fields(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test sparse incoming, outgoing and combined lists"""
+        mentor_id = authenticated_mentor_client.get("/api/me").json()["id"]
+        created = authenticated_mentee_client.post(
+            "/api/match-requests", json={"mentorId": mentor_id, "message": "Hello"}
+        ).json()
+
+        response = authenticated_mentor_client.get("/api/match-requests/incoming", params={"fields": "id,message"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"id": created["id"], "message": "Hello"}]
+
+        response = authenticated_mentee_client.get("/api/match-requests/outgoing", params={"fields": "status"})
+        assert response.json() == [{"status": "pending"}]
+
+        response = authenticated_mentee_client.get("/api/match-requests", params={"fields": "mentorId,id"})
+        assert response.json() == [{"id": created["id"], "mentorId": mentor_id}]
+
+    def test_outgoing_has_no_message_field(self, authenticated_mentee_client):
+        """Test fields= only accepts fields the list normally returns"""
+        response = authenticated_mentee_client.get("/api/match-requests/outgoing", params={"fields": "id,message"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,6 +1,16 @@
 import pytest
 from fastapi import status
 
+def create_mentor(client, name, skills, bio=None):
+    """Sign up a mentor with the given skills and return their id"""
+    email = f"{name.lower().replace(' ', '.')}@example.com"
+    client.post("/api/signup", json={"email": email, "password": "password123", "name": name, "role": "mentor"})
+    token = client.post("/api/login", json={"email": email, "password": "password123"}).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    profile = {"skills": skills} if bio is None else {"skills": skills, "bio": bio}
+    client.put("/api/profile", json=profile, headers=headers)
+    return client.get("/api/me", headers=headers).json()["id"]
+
 class TestMentors:
     """Test mentor-related endpoints"""
     
@@ -142,3 +152,808 @@ class TestMentors:
         response = client.get("/api/mentors/1")
         # Accept both 401 and 403 as valid unauthorized responses
         assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+    def test_filter_mentors_by_skill_uses_current_skills(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test the skill filter follows profile updates"""
+        mentor_id = authenticated_mentor_client.get("/api/me").json()["id"]
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["Python", "Django"]})
+
+        response = authenticated_mentee_client.get("/api/mentors?skill=Python")
+        assert [mentor["id"] for mentor in response.json()] == [mentor_id]
+
+        # Changing skills moves the mentor between index entries
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["Go"]})
+        assert authenticated_mentee_client.get("/api/mentors?skill=Python").json() == []
+        response = authenticated_mentee_client.get("/api/mentors?tech_stack=Go")
+        assert [mentor["id"] for mentor in response.json()] == [mentor_id]
+
+
+class TestSkillIndex:
+    """Test the in-memory skill index"""
+
+    def test_index_loads_from_database_and_updates(self, client):
+        """Test lazy loading and incremental updates"""
+        from tests.conftest import override_get_db
+        from app.core.skill_index import SkillIndex
+        from app.core.skills import set_mentor_skills
+        from app.database import User
+
+        db = next(override_get_db())
+        try:
+            mentor = User(email="m@example.com", hashed_password="x", name="M", role="mentor")
+            db.add(mentor)
+            set_mentor_skills(db, mentor, ["React", "Go"])
+            db.commit()
+
+            index = SkillIndex()
+            assert index.mentors_with(db, "React") == {mentor.id}
+            assert index.mentors_with(db, "reactjs") == {mentor.id}
+            assert index.mentors_with(db, "Rust") == frozenset()
+
+            index.update_mentor(mentor.id, ["rust"])
+            assert index.mentors_with(db, "React") == frozenset()
+            assert index.mentors_with(db, "Rust") == {mentor.id}
+
+            index.update_mentor(mentor.id, [])
+            assert index.mentors_with(db, "Rust") == frozenset()
+        finally:
+            db.close()
+
+
+class TestMentorSkills:
+    """Test the normalized mentor_skills table"""
+
+    def test_skill_key_normalizes_case_and_aliases(self):
+        """Test canonical skill keys"""
+        from app.core.skills import skill_key
+
+        assert skill_key("  JavaScript ") == "javascript"
+        assert skill_key("JS") == "javascript"
+        assert skill_key("Node  JS") == "node js"
+        assert skill_key("golang") == "go"
+
+    def test_filter_matches_aliases(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test filtering by an alias finds the mentor's spelling"""
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["JavaScript", "Golang"]})
+
+        response = authenticated_mentee_client.get("/api/mentors?skill=js")
+        assert len(response.json()) == 1
+        # Mentors keep their own spelling and order
+        assert response.json()[0]["profile"]["skills"] == ["JavaScript", "Golang"]
+        assert len(authenticated_mentee_client.get("/api/mentors?tech_stack=GO").json()) == 1
+
+    def test_duplicate_skills_are_collapsed(self, authenticated_mentor_client):
+        """Test skills that share a key are stored once"""
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["React", "reactjs", "Vue"]})
+        response = authenticated_mentor_client.put("/api/profile", json={"skills": ["Vue", "React", "react"]})
+        assert response.json()["profile"]["skills"] == ["Vue", "React"]
+        assert authenticated_mentor_client.get("/api/me").json()["profile"]["skills"] == ["Vue", "React"]
+
+    def test_skill_created_concurrently(self, client):
+        """Test creating a skill another session just inserted reuses its row"""
+        from tests.conftest import override_get_db
+        from app.core.skill_trigrams import skill_trigrams
+        from app.core.skills import _insert_missing_skills, get_or_create_skills
+        from app.database import Skill
+
+        db = next(override_get_db())
+        other = next(override_get_db())
+        try:
+            get_or_create_skills(db, ["Python"])
+            db.commit()
+            skill_trigrams.resolve(db, "python")
+
+            # The key was missing when this session looked, then another one created it
+            get_or_create_skills(other, ["Rust"])
+            other.commit()
+            skills = _insert_missing_skills(db, {"rust": "rust", "elixir": "Elixir"})
+            db.commit()
+
+            assert skills["rust"].name == "Rust"
+            assert db.query(Skill).filter(Skill.key == "rust").count() == 1
+            assert skill_trigrams.resolve(db, "elixr") == ("elixir", "Elixir")
+        finally:
+            db.close()
+            other.close()
+
+    def test_sort_by_first_skill(self, authenticated_mentee_client, client):
+        """Test sort_by=tech_stack orders by each mentor's first skill"""
+        for name, skills in [("A", ["Vue"]), ("B", ["Angular"]), ("C", [])]:
+            create_mentor(client, name, skills)
+
+        response = authenticated_mentee_client.get("/api/mentors?sort_by=tech_stack")
+        names = [mentor["profile"]["name"] for mentor in response.json()]
+        assert names.index("B") < names.index("A")
+
+    def test_migrate_legacy_tech_stack(self, client):
+        """Test JSON tech_stack values move into mentor_skills"""
+        from tests.conftest import override_get_db
+        from app.core.skills import skill_labels
+        from app.database import User
+        from app.migrations import migrate_mentor_skills
+
+        db = next(override_get_db())
+        try:
+            mentor = User(email="m@example.com", hashed_password="x", name="M", role="mentor",
+                          tech_stack='["React", "JS"]')
+            other = User(email="o@example.com", hashed_password="x", name="O", role="mentor",
+                         tech_stack='["react"]')
+            broken = User(email="b@example.com", hashed_password="x", name="B", role="mentor",
+                          tech_stack="not json")
+            mentee = User(email="e@example.com", hashed_password="x", name="E", role="mentee",
+                          tech_stack='["Go"]')
+            db.add_all([mentor, other, broken, mentee])
+            db.commit()
+
+            assert migrate_mentor_skills(db) == 2
+            mentor = db.query(User).filter(User.email == "m@example.com").one()
+            assert skill_labels(mentor) == ["React", "JS"]
+            assert mentor.tech_stack is None
+            other = db.query(User).filter(User.email == "o@example.com").one()
+            assert skill_labels(other) == ["react"]
+            # Values that couldn't be migrated are kept
+            broken = db.query(User).filter(User.email == "b@example.com").one()
+            assert skill_labels(broken) is None
+            assert broken.tech_stack == "not json"
+            mentee = db.query(User).filter(User.email == "e@example.com").one()
+            assert mentee.tech_stack == '["Go"]'
+            assert migrate_mentor_skills(db) == 0
+        finally:
+            db.close()
+
+
+class TestSkillExpressions:
+    """Test AND/OR skill expressions"""
+
+    def test_parse_skill_query(self):
+        """Test precedence, aliases and multi-word skills"""
+        from app.core.skill_query import parse_skill_query
+
+        assert parse_skill_query("React AND ts") == ("and", [("skill", "react"), ("skill", "typescript")])
+        assert parse_skill_query("go | rust & c++") == (
+            "or", [("skill", "go"), ("and", [("skill", "rust"), ("skill", "c++")])]
+        )
+        assert parse_skill_query("(go or rust) and google cloud") == (
+            "and", [("or", [("skill", "go"), ("skill", "rust")]), ("skill", "google cloud")]
+        )
+
+    @pytest.mark.parametrize("text", ["(react", "react and", "or go", "react )", " "])
+    def test_parse_skill_query_rejects_malformed(self, text):
+        """Test malformed expressions raise SkillQueryError"""
+        from app.core.skill_query import SkillQueryError, parse_skill_query
+
+        with pytest.raises(SkillQueryError):
+            parse_skill_query(text)
+
+    def test_deep_nesting_rejected(self, authenticated_mentee_client):
+        """Test deeply nested parentheses give 400 instead of exhausting the stack"""
+        from app.core.skill_query import MAX_DEPTH, parse_skill_query
+
+        assert parse_skill_query("(" * MAX_DEPTH + "go" + ")" * MAX_DEPTH) == ("skill", "go")
+        response = authenticated_mentee_client.get("/api/mentors", params={"skills": "(" * 1000 + "go" + ")" * 1000})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_filter_mentors_by_expression(self, authenticated_mentee_client, client):
+        """Test AND, OR and grouping over mentors' skills"""
+        full_stack = create_mentor(client, "Alice", ["React", "TypeScript", "Go"])
+        frontend = create_mentor(client, "Bob", ["React", "JavaScript"])
+        backend = create_mentor(client, "Carol", ["Rust"])
+
+        def ids(expression):
+            response = authenticated_mentee_client.get("/api/mentors", params={"skills": expression})
+            assert response.status_code == status.HTTP_200_OK
+            return sorted(mentor["id"] for mentor in response.json())
+
+        assert ids("react AND typescript") == [full_stack]
+        assert ids("go OR rust") == sorted([full_stack, backend])
+        assert ids("react & (ts | js)") == sorted([full_stack, frontend])
+        assert ids("react and rust") == []
+
+        # Combines with the single-skill filter
+        response = authenticated_mentee_client.get("/api/mentors", params={"skills": "react", "skill": "js"})
+        assert [mentor["id"] for mentor in response.json()] == [frontend]
+
+    def test_sees_skills_written_elsewhere(self, authenticated_mentee_client, client):
+        """Test skills written outside this process are found without a stale index"""
+        from tests.conftest import TestingSessionLocal
+        from app.core.skills import set_mentor_skills
+        from app.database import User
+
+        mentor_id = create_mentor(client, "Alice", ["Go"])
+        assert authenticated_mentee_client.get("/api/mentors", params={"skills": "go"}).json()
+
+        # e.g. another worker or `make migrate-skills`
+        db = TestingSessionLocal()
+        try:
+            set_mentor_skills(db, db.get(User, mentor_id), ["Rust"])
+            db.commit()
+        finally:
+            db.close()
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"skills": "rust"})
+        assert [mentor["id"] for mentor in response.json()] == [mentor_id]
+
+    def test_statement_size_independent_of_matches(self, authenticated_mentee_client, client):
+        """Test the filter doesn't inline the matching mentor ids"""
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        def mentor_query_params():
+            statements = []
+            listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                response = authenticated_mentee_client.get("/api/mentors", params={"skills": "go or rust"})
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            [(statement, parameters)] = [entry for entry in statements if "EXISTS" in entry[0]]
+            return len(response.json()), len(parameters)
+
+        create_mentor(client, "Mentor 0", ["Go"])
+        few = mentor_query_params()
+        for n in range(1, 6):
+            create_mentor(client, f"Mentor {n}", ["Rust"])
+        many = mentor_query_params()
+        assert (few[0], many[0]) == (1, 6)
+        assert few[1] == many[1]
+
+    def test_invalid_expression_returns_400(self, authenticated_mentee_client):
+        """Test malformed expressions are rejected"""
+        response = authenticated_mentee_client.get("/api/mentors", params={"skills": "react AND"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestMentorPagination:
+    """Test keyset pagination of the mentor list"""
+
+    def fetch_all_pages(self, client, **params):
+        """Follow X-Next-Cursor until the last page; returns the pages of names"""
+        pages = []
+        cursor = None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = client.get("/api/mentors", params=query)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append([mentor["profile"]["name"] for mentor in response.json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return pages
+
+    @pytest.fixture
+    def mentors(self, client):
+        for name, skills in [("Eve", ["Go"]), ("Dan", ["Rust"]), ("Cat", ["Go", "React"]),
+                             ("Bob", []), ("Ann", ["React"])]:
+            create_mentor(client, name, skills)
+
+    def test_pages_by_name(self, authenticated_mentee_client, mentors):
+        """Test pages follow name order without gaps or repeats"""
+        pages = self.fetch_all_pages(authenticated_mentee_client, limit=2)
+        assert pages == [["Ann", "Bob"], ["Cat", "Dan"], ["Eve"]]
+
+    def test_pages_by_first_skill(self, authenticated_mentee_client, mentors):
+        """Test pagination keyed on the first skill, with mentors without skills first"""
+        pages = self.fetch_all_pages(authenticated_mentee_client, limit=2, sort_by="tech_stack")
+        assert pages == [["Bob", "Cat"], ["Eve", "Ann"], ["Dan"]]
+
+    def test_pages_with_filters(self, authenticated_mentee_client, mentors):
+        """Test pagination combined with skill filters and search"""
+        pages = self.fetch_all_pages(authenticated_mentee_client, limit=1, skills="go OR react")
+        assert pages == [["Ann"], ["Cat"], ["Eve"]]
+        pages = self.fetch_all_pages(authenticated_mentee_client, limit=1, skill="go", search="c")
+        assert pages == [["Cat"]]
+        # Search results page by relevance, a float rank
+        pages = self.fetch_all_pages(authenticated_mentee_client, limit=1, search="go")
+        assert sorted(name for page in pages for name in page) == ["Cat", "Eve"]
+
+    def test_no_cursor_on_last_page(self, authenticated_mentee_client, mentors):
+        """Test a page holding the remaining mentors has no next cursor"""
+        response = authenticated_mentee_client.get("/api/mentors?limit=5")
+        assert len(response.json()) == 5
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor_returns_400(self, authenticated_mentee_client, mentors):
+        """Test malformed cursors and cursors from another sort order"""
+        response = authenticated_mentee_client.get("/api/mentors?cursor=not-a-cursor")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        cursor = authenticated_mentee_client.get("/api/mentors?limit=1").headers["X-Next-Cursor"]
+        response = authenticated_mentee_client.get(f"/api/mentors?sort_by=tech_stack&cursor={cursor}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+    @pytest.mark.parametrize("values", [[{"a": 1}, 1], [[1], 1], ["Ann", "1"], ["Ann", True], [None, 1]])
+    def test_forged_cursor_values_return_400(self, authenticated_mentee_client, mentors, values):
+        """Test cursor values must match the types of the sort columns"""
+        from app.core.pagination import encode_cursor
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"cursor": encode_cursor("name", values)})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+class TestMentorFullTextSearch:
+    """Test full-text search over mentor name, bio and skills"""
+
+    def search(self, client, text, **params):
+        response = client.get("/api/mentors", params=dict(params, search=text))
+        assert response.status_code == status.HTTP_200_OK
+        return [mentor["profile"]["name"] for mentor in response.json()]
+
+    def test_match_query_uses_prefixes(self):
+        """Test every word becomes a quoted prefix term"""
+        from app.core.mentor_search import match_query
+
+        assert match_query("pyth Back-end") == '"pyth"* "Back"* "end"*'
+        assert match_query('"*) OR') == '"OR"*'
+        assert match_query("++") == ""
+
+    def test_search_name_bio_and_skills(self, authenticated_mentee_client, client):
+        """Test words match by prefix in any column, ranked by relevance"""
+        create_mentor(client, "Grace Hopper", ["COBOL"], bio="Compilers and Python tooling")
+        create_mentor(client, "Python Pete", ["Django"], bio="Web apps")
+        create_mentor(client, "Linus", ["C", "Python"], bio="Kernels")
+        create_mentor(client, "Ada", ["Rust"], bio="Embedded systems")
+
+        # A name match outranks a skill match, which outranks a bio match
+        assert self.search(authenticated_mentee_client, "pyth") == ["Python Pete", "Linus", "Grace Hopper"]
+        assert self.search(authenticated_mentee_client, "pyth comp") == ["Grace Hopper"]
+        assert self.search(authenticated_mentee_client, "embedded") == ["Ada"]
+        assert self.search(authenticated_mentee_client, "pyth", sort_by="name") == [
+            "Grace Hopper", "Linus", "Python Pete"
+        ]
+
+        pages = []
+        cursor = None
+        while True:
+            params = {"search": "pyth", "limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = authenticated_mentee_client.get("/api/mentors", params=params)
+            pages.append([mentor["profile"]["name"] for mentor in response.json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        assert pages == [["Python Pete", "Linus"], ["Grace Hopper"]]
+
+    def test_search_follows_profile_updates(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test profile changes are reflected in the search table"""
+        authenticated_mentor_client.put("/api/profile", json={"bio": "Distributed systems", "skills": ["Go"]})
+        assert len(self.search(authenticated_mentee_client, "distributed")) == 1
+
+        authenticated_mentor_client.put("/api/profile", json={"bio": "Databases"})
+        assert self.search(authenticated_mentee_client, "distributed") == []
+        assert len(self.search(authenticated_mentee_client, "datab golang")) == 0
+        assert len(self.search(authenticated_mentee_client, "datab go")) == 1
+
+    def test_search_without_words_falls_back_to_substring(self, authenticated_mentee_client, client):
+        """Test punctuation-only searches still match names"""
+        create_mentor(client, "C++ Guru", ["C++"])
+        assert self.search(authenticated_mentee_client, "++") == ["C++ Guru"]
+
+    def test_search_table_backfills_existing_mentors(self, client):
+        """Test creating the search table indexes mentors already in the database"""
+        from sqlalchemy import text
+        from app.core.mentor_search import create_search_table, search_matches
+        from app.core.skills import set_mentor_skills
+        from app.database import User
+        from tests.conftest import engine, override_get_db
+
+        db = next(override_get_db())
+        try:
+            mentor = User(email="m@example.com", hashed_password="x", name="M", role="mentor", bio="Graphs")
+            db.add(mentor)
+            set_mentor_skills(db, mentor, ["Neo4j"])
+            db.commit()
+
+            with engine.begin() as conn:
+                conn.execute(text("DROP TABLE mentor_search"))
+                create_search_table(conn)
+
+            matches = search_matches(db, "neo4")
+            assert [row.mentor_id for row in db.execute(matches.select())] == [mentor.id]
+        finally:
+            db.close()
+
+
+class TestMentorRelevanceSearch:
+    """Test TF-IDF ranked free-text search"""
+
+    @pytest.fixture(autouse=True)
+    def rebuild_immediately(self, monkeypatch):
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "TFIDF_REBUILD_SECONDS", 0)
+
+    def search(self, client, q, k=None):
+        params = {"q": q} if k is None else {"q": q, "k": k}
+        response = client.get("/api/mentors/search", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [mentor["profile"]["name"] for mentor in response.json()]
+
+    def test_ranks_by_similarity(self, authenticated_mentee_client, client):
+        """Test mentors sharing rarer query terms rank higher"""
+        create_mentor(client, "Backend", ["Python", "PostgreSQL"], bio="Backend performance tuning and profiling")
+        create_mentor(client, "Frontend", ["React"], bio="Frontend performance and accessibility")
+        create_mentor(client, "Data", ["Python", "Pandas"], bio="Data pipelines")
+        create_mentor(client, "Mobile", ["Swift"], bio="iOS apps")
+
+        names = self.search(authenticated_mentee_client, "help with backend performance in Python")
+        assert names[0] == "Backend"
+        assert set(names) == {"Backend", "Frontend", "Data"}
+        assert self.search(authenticated_mentee_client, "backend performance python", k=2) == ["Backend", "Data"]
+        assert self.search(authenticated_mentee_client, "golang") == []
+        # Aliases match the canonical skill
+        assert self.search(authenticated_mentee_client, "py pandas")[0] == "Data"
+
+    def test_follows_profile_updates(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test changed bios and skills are searchable on the next query"""
+        assert self.search(authenticated_mentee_client, "kubernetes") == []
+        authenticated_mentor_client.put("/api/profile", json={"bio": "Kubernetes operator", "skills": ["Go"]})
+        assert self.search(authenticated_mentee_client, "kubernetes") == ["Test Mentor"]
+        assert self.search(authenticated_mentee_client, "golang") == ["Test Mentor"]
+
+        authenticated_mentor_client.put("/api/profile", json={"bio": "Compilers"})
+        assert self.search(authenticated_mentee_client, "kubernetes") == []
+
+    def test_requires_query_and_mentee(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test validation and role checks"""
+        assert authenticated_mentee_client.get("/api/mentors/search").status_code == status.HTTP_400_BAD_REQUEST
+        response = authenticated_mentor_client.get("/api/mentors/search?q=python")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_top_k_selection(self):
+        """Test the index returns the k best scores in order"""
+        from app.core.tfidf_index import TfidfIndex
+
+        index = TfidfIndex()
+        index._loaded = True
+        for mentor_id, bio in enumerate(["rust", "rust go", "rust go python", "java", "rust rust go"], start=1):
+            index.update_mentor(mentor_id, bio, [])
+
+        results = index.search(None, "rust", 2)
+        assert len(results) == 2
+        assert [mentor_id for mentor_id, _ in results] == [1, 5]
+        assert results[0][1] == pytest.approx(1.0)
+        assert all(score > 0 for _, score in index.search(None, "rust go", 10))
+        assert {mentor_id for mentor_id, _ in index.search(None, "rust go", 10)} == {1, 2, 3, 5}
+
+
+class TestMentorRecommendations:
+    """Test interest-based mentor recommendations"""
+
+    def recommended(self, client, **params):
+        response = client.get("/api/mentors/recommended", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [mentor["profile"]["name"] for mentor in response.json()]
+
+    def test_score_mentors(self):
+        """Test overlap scoring, penalties and ordering"""
+        import numpy as np
+        from app.core.recommendations import score_mentors
+
+        python, go = 0b11110, 0b00110
+        accepted = np.array([0, 0, 1, 0, 0])
+        pending = np.array([0, 0, 0, 5, 0])
+        ranking = score_mentors([python, go], accepted, pending, depth=10)
+        assert [mentor_id for mentor_id, _ in ranking] == [1, 2, 4, 3]
+        assert [score for _, score in ranking] == pytest.approx([1.0, 0.5, 0.5, 0.2])
+        assert score_mentors([python, go], accepted, pending, depth=1) == [(1, 1.0)]
+        assert score_mentors([0], accepted, pending, depth=10) == []
+
+    def test_recommendations_follow_interests_and_matches(self, authenticated_mentee_client, client):
+        """Test ranking by overlap, down-ranking matched mentors and cache invalidation"""
+        from tests.conftest import override_get_db
+        from app.database import MatchingRequest
+
+        create_mentor(client, "Alice", ["Python", "Go"])
+        create_mentor(client, "Bob", ["Python"])
+        create_mentor(client, "Carol", ["Rust"])
+        dave = create_mentor(client, "Dave", ["golang", "python"])
+
+        assert self.recommended(authenticated_mentee_client) == []
+        response = authenticated_mentee_client.put("/api/profile", json={"interests": ["Python", "Go"]})
+        assert response.json()["profile"]["interests"] == ["Python", "Go"]
+        assert self.recommended(authenticated_mentee_client) == ["Alice", "Dave", "Bob"]
+        assert self.recommended(authenticated_mentee_client, k=1) == ["Alice"]
+
+        # A pending request costs a little, an accepted match a lot
+        authenticated_mentee_client.post("/api/match-requests", json={"mentorId": dave, "message": "Hi"})
+        assert self.recommended(authenticated_mentee_client) == ["Alice", "Dave", "Bob"]
+        db = next(override_get_db())
+        try:
+            db.query(MatchingRequest).filter(MatchingRequest.mentor_id == dave).one().status = "accepted"
+            db.commit()
+        finally:
+            db.close()
+        assert self.recommended(authenticated_mentee_client) == ["Alice", "Bob", "Dave"]
+
+        # Changed interests and skills are picked up
+        authenticated_mentee_client.put("/api/profile", json={"interests": ["Rust"]})
+        assert self.recommended(authenticated_mentee_client) == ["Carol"]
+        token = client.post("/api/login", json={"email": "carol@example.com", "password": "password123"}).json()["token"]
+        client.put("/api/profile", json={"skills": ["Zig"]}, headers={"Authorization": f"Bearer {token}"})
+        assert self.recommended(authenticated_mentee_client) == []
+
+    def test_rankings_expire(self, authenticated_mentee_client, client, monkeypatch):
+        """Test writes made outside this worker show up once cached state expires"""
+        from tests.conftest import TestingSessionLocal
+        from app.core.recommendations import mentor_recommender
+        from app.core.skill_index import skill_index
+        from app.core.skills import set_mentor_skills
+        from app.database import User
+
+        mentor_id = create_mentor(client, "Alice", ["Go"])
+        authenticated_mentee_client.put("/api/profile", json={"interests": ["Rust"]})
+        assert self.recommended(authenticated_mentee_client) == []
+
+        db = TestingSessionLocal()
+        try:
+            set_mentor_skills(db, db.get(User, mentor_id), ["Rust"])
+            db.commit()
+        finally:
+            db.close()
+
+        # Still within the max age: this worker hasn't seen the write
+        assert self.recommended(authenticated_mentee_client) == []
+        monkeypatch.setattr(mentor_recommender, "max_age", 0)
+        monkeypatch.setattr(skill_index, "max_age", 0)
+        assert self.recommended(authenticated_mentee_client) == ["Alice"]
+
+    def test_interests_are_mentee_only(self, authenticated_mentor_client):
+        """Test mentors can't declare interests"""
+        response = authenticated_mentor_client.put("/api/profile", json={"interests": ["Python"]})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestSkillFacets:
+    """Test per-skill mentor counts"""
+
+    def facets(self, client, **params):
+        response = client.get("/api/mentors/facets", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return {facet["skill"]: facet["count"] for facet in response.json()}
+
+    def test_counts_and_narrowing(self, authenticated_mentee_client, client):
+        """Test counts overall and within skill, expression and search filters"""
+        create_mentor(client, "Alice", ["Python", "Go"], bio="Backend systems")
+        create_mentor(client, "Bob", ["python", "Django"], bio="Web backend")
+        create_mentor(client, "Carol", ["React"], bio="Frontend")
+
+        assert self.facets(authenticated_mentee_client) == {"Python": 2, "Go": 1, "Django": 1, "React": 1}
+        assert self.facets(authenticated_mentee_client, skill="golang") == {"Python": 1, "Go": 1}
+        assert self.facets(authenticated_mentee_client, skills="django OR react") == {
+            "Python": 1, "Django": 1, "React": 1
+        }
+        assert self.facets(authenticated_mentee_client, search="backend") == {"Python": 2, "Go": 1, "Django": 1}
+        assert self.facets(authenticated_mentee_client, search="backend", skill="react") == {}
+        assert self.facets(authenticated_mentee_client, search="nobody") == {}
+
+        response = authenticated_mentee_client.get("/api/mentors/facets?limit=1")
+        assert response.json() == [{"skill": "Python", "count": 2}]
+
+    def test_counts_follow_skills_written_elsewhere(self, authenticated_mentee_client, client):
+        """Test counts come from the database, like the mentor list they filter"""
+        from tests.conftest import TestingSessionLocal
+        from app.core.skills import set_mentor_skills
+        from app.database import User
+
+        mentor_id = create_mentor(client, "Alice", ["Go"])
+        assert self.facets(authenticated_mentee_client) == {"Go": 1}
+
+        db = TestingSessionLocal()
+        try:
+            set_mentor_skills(db, db.get(User, mentor_id), ["Go", "Rust"])
+            db.commit()
+        finally:
+            db.close()
+
+        assert self.facets(authenticated_mentee_client) == {"Go": 1, "Rust": 1}
+        assert self.facets(authenticated_mentee_client, skills="rust") == {"Go": 1, "Rust": 1}
+        assert self.facets(authenticated_mentee_client, limit=1) == {"Go": 1}
+
+    def test_counts_follow_profile_updates(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test the aggregate is updated when skills change"""
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["Go"]})
+        assert self.facets(authenticated_mentee_client) == {"Go": 1}
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["Rust"]})
+        assert self.facets(authenticated_mentee_client) == {"Rust": 1}
+
+    def test_mentees_only(self, authenticated_mentor_client):
+        """Test mentors can't read facets"""
+        response = authenticated_mentor_client.get("/api/mentors/facets")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestMentorSuggestions:
+    """Test prefix autocomplete for names and skills"""
+
+    def suggest(self, client, prefix, **params):
+        response = client.get("/api/mentors/suggest", params=dict(params, prefix=prefix))
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        return body["skills"], [mentor["name"] for mentor in body["mentors"]]
+
+    def test_completes_names_and_skills(self, authenticated_mentee_client, client):
+        """Test name words and skills complete, common skills first"""
+        create_mentor(client, "Grace Hopper", ["Go", "GraphQL"])
+        create_mentor(client, "Guido", ["Go", "Python"])
+        create_mentor(client, "Linus", ["C"])
+
+        assert self.suggest(authenticated_mentee_client, "g") == (["Go", "GraphQL"], ["Grace Hopper", "Guido"])
+        assert self.suggest(authenticated_mentee_client, "HOP") == ([], ["Grace Hopper"])
+        assert self.suggest(authenticated_mentee_client, "golang") == (["Go"], [])
+        assert self.suggest(authenticated_mentee_client, "g", limit=1) == (["Go"], ["Grace Hopper"])
+        assert self.suggest(authenticated_mentee_client, "x") == ([], [])
+
+    def test_follows_profile_updates(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test renamed mentors and changed skills are suggested"""
+        assert self.suggest(authenticated_mentee_client, "test") == ([], ["Test Mentor"])
+        authenticated_mentor_client.put("/api/profile", json={"name": "Ada Lovelace", "skills": ["Rust"]})
+        assert self.suggest(authenticated_mentee_client, "test") == ([], [])
+        assert self.suggest(authenticated_mentee_client, "love") == ([], ["Ada Lovelace"])
+        assert self.suggest(authenticated_mentee_client, "ru") == (["Rust"], [])
+
+        authenticated_mentor_client.put("/api/profile", json={"skills": ["Go"]})
+        assert self.suggest(authenticated_mentee_client, "ru") == ([], [])
+
+    def test_loads_existing_mentors(self, client):
+        """Test the index is built from the database on first use"""
+        from tests.conftest import override_get_db
+        from app.core.skills import set_mentor_skills
+        from app.core.suggestions import SuggestionIndex
+        from app.database import User
+
+        db = next(override_get_db())
+        try:
+            for email, name, skills in [("a@example.com", "Ann Lee", ["Go"]), ("b@example.com", "Bo", ["go", "Git"])]:
+                mentor = User(email=email, hashed_password="x", name=name, role="mentor")
+                db.add(mentor)
+                set_mentor_skills(db, mentor, skills)
+            db.commit()
+
+            index = SuggestionIndex()
+            skills, mentors = index.suggest(db, "g", 5)
+            assert skills == ["Go", "Git"]
+            assert index.suggest(db, "lee", 5)[1] == [(1, "Ann Lee")]
+        finally:
+            db.close()
+
+
+class TestFuzzySkillFilter:
+    """Test typo-tolerant skill resolution"""
+
+    def test_trigrams(self):
+        """Test words are padded like pg_trgm"""
+        from app.core.skill_trigrams import trigrams
+
+        assert trigrams("go") == {"  g", " go", "go "}
+        assert trigrams("ab cd") == {"  a", " ab", "ab ", "  c", " cd", "cd "}
+
+    def test_misspelled_skill_resolves(self, authenticated_mentee_client, client):
+        """Test a typo finds the closest skill and echoes it"""
+        from urllib.parse import unquote
+
+        mentor_id = create_mentor(client, "Alice", ["JavaScript", "Kubernetes"])
+        create_mentor(client, "Bob", ["Java"])
+
+        response = authenticated_mentee_client.get("/api/mentors?skill=javscript")
+        assert [mentor["id"] for mentor in response.json()] == [mentor_id]
+        assert unquote(response.headers["X-Resolved-Skill"]) == "JavaScript"
+
+        response = authenticated_mentee_client.get("/api/mentors?tech_stack=kubernets")
+        assert response.headers["X-Resolved-Skill"] == "Kubernetes"
+
+        # Exact keys win over similar ones
+        response = authenticated_mentee_client.get("/api/mentors?skill=JAVA")
+        assert [mentor["profile"]["name"] for mentor in response.json()] == ["Bob"]
+        assert response.headers["X-Resolved-Skill"] == "Java"
+
+        response = authenticated_mentee_client.get("/api/mentors?skill=haskell")
+        assert response.json() == []
+        assert "X-Resolved-Skill" not in response.headers
+
+        response = authenticated_mentee_client.get("/api/mentors/facets?skill=javscript")
+        assert response.headers["X-Resolved-Skill"] == "JavaScript"
+        assert {facet["skill"] for facet in response.json()} == {"JavaScript", "Kubernetes"}
+
+
+class TestBatchMentorLookup:
+    """Test GET /api/mentors?ids=..."""
+
+    def test_returns_requested_order_and_missing_ids(self, authenticated_mentee_client, client):
+        """Test cards come back in request order with missing ids reported"""
+        alice = create_mentor(client, "Alice", ["Go"])
+        bob = create_mentor(client, "Bob", ["Rust"])
+        mentee = authenticated_mentee_client.get("/api/me").json()["id"]
+
+        response = authenticated_mentee_client.get(f"/api/mentors?ids={bob},999,{alice},{bob},{mentee}")
+        assert response.status_code == status.HTTP_200_OK
+        assert [mentor["id"] for mentor in response.json()] == [bob, alice]
+        assert response.json()[0]["profile"]["skills"] == ["Rust"]
+        assert response.headers["X-Missing-Ids"] == f"999,{mentee}"
+
+        response = authenticated_mentee_client.get(f"/api/mentors?ids={alice}&skill=rust")
+        assert [mentor["id"] for mentor in response.json()] == [alice]
+        assert "X-Missing-Ids" not in response.headers
+
+    def test_single_query(self, authenticated_mentee_client, client):
+        """Test a batch costs a fixed number of queries"""
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        mentor_ids = [create_mentor(client, f"Mentor {n}", ["Go", "Python"]) for n in range(5)]
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_mentee_client.get("/api/mentors", params={"ids": ",".join(map(str, mentor_ids))})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(response.json()) == 5
+        # Users and their skills; the rest is authentication
+        assert sum("FROM users" in statement for statement in statements) <= 2
+        assert sum("FROM mentor_skills" in statement for statement in statements) == 1
+
+    @pytest.mark.parametrize("ids", ["1,abc", ",".join(str(n) for n in range(101))])
+    def test_invalid_ids_return_400(self, authenticated_mentee_client, ids):
+        """Test malformed and oversized id lists"""
+        response = authenticated_mentee_client.get("/api/mentors", params={"ids": ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestMentorFieldsets:
+    """Test fields= on the mentor endpoints"""
+
+    def test_list_returns_only_requested_fields(self, authenticated_mentee_client, client):
+        """Test sparse list items keep the nested profile shape"""
+        create_mentor(client, "Alice", ["Go"], bio="Gopher")
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"fields": "id,name,skills"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [set(mentor) for mentor in response.json()] == [{"id", "profile"}]
+        assert response.json()[0]["profile"] == {"name": "Alice", "skills": ["Go"]}
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"fields": "profile"})
+        assert response.json()[0] == {
+            "profile": {"name": "Alice", "bio": "Gopher", "imageUrl": response.json()[0]["profile"]["imageUrl"], "skills": ["Go"]}
+        }
+
+    def test_selects_only_requested_columns(self, authenticated_mentee_client, client):
+        """Test unrequested columns and skills are not read"""
+        from sqlalchemy import event
+        from tests.conftest import engine
+
+        create_mentor(client, "Alice", ["Go"], bio="Gopher")
+        statements = []
+        listener = lambda *args, **kwargs: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = authenticated_mentee_client.get("/api/mentors", params={"fields": "id,name"})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert response.json()[0]["profile"] == {"name": "Alice"}
+        mentor_queries = [statement for statement in statements if "users.role = ?" in statement]
+        assert mentor_queries and all("users.bio" not in statement for statement in mentor_queries)
+        assert not any("FROM mentor_skills" in statement for statement in statements)
+
+    def test_keeps_pagination_and_batch_headers(self, authenticated_mentee_client, client):
+        """Test sparse responses still carry X-Next-Cursor and X-Missing-Ids"""
+        alice = create_mentor(client, "Alice", ["Go"])
+        create_mentor(client, "Bob", ["Go"])
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"fields": "id", "limit": 1})
+        assert response.json() == [{"id": alice}]
+        assert "X-Next-Cursor" in response.headers
+
+        response = authenticated_mentee_client.get("/api/mentors", params={"fields": "id", "ids": f"{alice},999"})
+        assert response.json() == [{"id": alice}]
+        assert response.headers["X-Missing-Ids"] == "999"
+
+    def test_mentor_by_id(self, authenticated_mentee_client, client):
+        """Test fields= on a single mentor"""
+        alice = create_mentor(client, "Alice", ["Go"])
+
+        response = authenticated_mentee_client.get(f"/api/mentors/{alice}", params={"fields": "email,skills"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"email": "alice@example.com", "profile": {"skills": ["Go"]}}
+
+    @pytest.mark.parametrize("fields", ["id,password", ","])
+    def test_invalid_fields_return_400(self, authenticated_mentee_client, fields):
+        """Test unknown and empty field lists"""
+        response = authenticated_mentee_client.get("/api/mentors", params={"fields": fields})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,74 @@
+import asyncio
+from fastapi import status
+
+from app.core.auth import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.password_pool import PasswordHashPool
+
+
+class TestPasswordHashPool:
+    """Test the bcrypt worker pool"""
+
+    def test_hash_and_verify_on_pool(self):
+        """Test hashing and verification run through the pool"""
+        pool = PasswordHashPool(max_workers=2)
+
+        async def scenario():
+            hashed = await pool.run(get_password_hash, "secret123")
+            ok = await pool.run(verify_password, "secret123", hashed)
+            bad = await pool.run(verify_password, "wrong", hashed)
+            return ok, bad
+
+        try:
+            ok, bad = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+
+        assert ok is True
+        assert bad is False
+
+    def test_stats_track_completed_work(self):
+        """Test queue depth and wait statistics are recorded"""
+        pool = PasswordHashPool(max_workers=1)
+
+        async def scenario():
+            await asyncio.gather(*(pool.run(sum, [1, 2, 3]) for _ in range(5)))
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+
+        stats = pool.stats()
+        assert stats["workers"] == 1
+        assert stats["completed"] == 5
+        assert stats["queue_depth"] == 0
+        assert stats["running"] == 0
+        assert stats["max_wait_ms"] >= 0
+
+    def test_pool_recreated_after_shutdown(self):
+        """Test the pool can be used again after shutdown"""
+        pool = PasswordHashPool(max_workers=1)
+        pool.shutdown()
+        assert asyncio.run(pool.run(len, "abc")) == 3
+        pool.shutdown()
+
+    def test_metrics_endpoint_reports_pool(self, client, test_user_mentee, metrics_key):
+        """Test /metrics exposes password hashing statistics"""
+        client.post("/api/signup", json=test_user_mentee)
+
+        response = client.get("/metrics", headers=metrics_key)
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()["password_hashing"]
+        assert stats["completed"] >= 1
+        assert "queue_depth" in stats
+        assert "avg_wait_ms" in stats
+
+    def test_metrics_require_api_key(self, client, metrics_key, monkeypatch):
+        """Test /metrics needs the configured key and is off without one"""
+        assert client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+        assert client.get("/metrics", headers={"X-API-Key": "wrong"}).status_code == status.HTTP_401_UNAUTHORIZED
+        assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+        monkeypatch.setattr(settings, "METRICS_API_KEY", None)
+        assert client.get("/metrics", headers=metrics_key).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,40 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.core.serializers import FastJSONResponse, NegotiatedResponse
+from app.main import app
+
+
+class TestSerializers:
+    """Test the orjson response class and the response builders"""
+
+    def test_matches_standard_json_encoding(self):
+        """Test orjson produces the same bytes as the standard JSONResponse"""
+        content = {"id": 1, "profile": {"name": "Zoë", "skills": ["Go", "C++"], "bio": None}, "score": 0.5}
+        assert FastJSONResponse(content).body == JSONResponse(content).body
+
+    def test_default_response_class(self, client):
+        """Test routes encode with orjson by default"""
+        assert app.router.default_response_class is NegotiatedResponse
+        response = client.get("/health")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "healthy"}
+
+    def test_profile_shape(self, authenticated_mentor_client):
+        """Test builders keep the response schema's shape"""
+        response = authenticated_mentor_client.get("/api/me")
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()) == {"id", "email", "role", "profile"}
+        # Mentors without skills get null, as before skills were normalized
+        assert response.json()["profile"]["skills"] is None
+        assert response.json()["profile"]["interests"] is None
+
+    def test_mentor_cards_omit_interests(self, authenticated_mentee_client, authenticated_mentor_client):
+        """Test interests only appear on the signed-in user's own profile"""
+        mentor_id = authenticated_mentor_client.get("/api/me").json()["id"]
+        for path in ("/api/mentors", f"/api/mentors/{mentor_id}", "/api/mentors/search?q=mentor"):
+            response = authenticated_mentee_client.get(path)
+            assert response.status_code == status.HTTP_200_OK
+            items = response.json() if isinstance(response.json(), list) else [response.json()]
+            assert all("interests" not in item["profile"] for item in items)
+        assert authenticated_mentee_client.get("/api/me").json()["profile"]["interests"] == []